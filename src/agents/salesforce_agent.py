@@ -7,20 +7,34 @@ Runs on Octavia (Pi cluster) with 500+ concurrent instances.
 
 import time
 import uuid
+import asyncio
+import random
 import signal
 import threading
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Awaitable, Dict, List, Optional, Callable, Set, Tuple
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+from queue import SimpleQueue
+from concurrent.futures import Future, wait
 import structlog
 
+try:
+    import uvloop
+except ImportError:  # optional faster event loop (Linux/macOS)
+    uvloop = None
+
 from ..auth.oauth import SalesforceAuth, AuthConfig
 from ..api.client import SalesforceClient, SalesforceAPIError
-from ..api.bulk import BulkClient, BulkJobResult
+from ..api.bulk import BulkClient, BulkJobResult, BulkAPIError, BulkJobSubmittedError
 from ..queue.task_queue import TaskQueue, Task, TaskStatus, TaskPriority
 
 logger = structlog.get_logger()
 
+# Seconds an org limits snapshot is reused by get_stats()
+LIMITS_CACHE_TTL = 60.0
+
+# Task payload keys that address the upsert rather than being record fields
+UPSERT_KEYS = frozenset({"external_id_field", "external_id"})
+
 
 @dataclass
 class AgentConfig:
@@ -38,10 +52,21 @@ class AgentConfig:
     max_workers: int = 4
     poll_interval: float = 1.0
     batch_size: int = 200
+    # Claimed create tasks for one sobject at or above this count go through
+    # a single Bulk API job instead of one REST call each (0 disables)
+    coalesce_threshold: int = 10
+    # Log per-task progress events for 1 in N tasks (errors are always logged)
+    log_sample_rate: int = 100
 
     # Queue settings
     queue_backend: str = "sqlite"
     queue_db_path: str = "~/.blackroad/task_queue.db"
+    queue_redis_url: str = "redis://localhost:6379/0"
+
+
+def _csv_row_key(data: Dict[str, Any], fieldnames: List[str]) -> tuple:
+    """Render a record's values the way the bulk CSV writer uploads them"""
+    return tuple("" if data.get(field) is None else str(data.get(field)) for field in fieldnames)
 
 
 class SalesforceAgent:
@@ -79,10 +104,12 @@ class SalesforceAgent:
         self.bulk = BulkClient(self.auth)
 
         # Initialize task queue
-        self.queue = TaskQueue(
-            backend=config.queue_backend,
-            db_path=config.queue_db_path
-        )
+        if config.queue_backend == "redis":
+            # Two pooled connections per worker covers claims plus completions
+            queue_options = {"url": config.queue_redis_url, "max_connections": config.max_workers * 2}
+        else:
+            queue_options = {"db_path": config.queue_db_path}
+        self.queue = TaskQueue(backend=config.queue_backend, **queue_options)
 
         # Operation handlers
         self._handlers: Dict[str, Callable] = {
@@ -92,6 +119,11 @@ class SalesforceAgent:
             "delete": self._handle_delete,
             "upsert": self._handle_upsert,
             "query": self._handle_query,
+        }
+
+        # Bulk jobs spend most of their time waiting on Salesforce, so they run as
+        # coroutines on the agent's event loop instead of occupying a worker
+        self._async_handlers: Dict[str, Callable[[Task], Awaitable[Dict[str, Any]]]] = {
             "bulk_insert": self._handle_bulk_insert,
             "bulk_update": self._handle_bulk_update,
             "bulk_delete": self._handle_bulk_delete,
@@ -99,7 +131,15 @@ class SalesforceAgent:
 
         # State
         self._running = False
-        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers: List[threading.Thread] = []
+        self._worker_queues: List[SimpleQueue] = []
+        self._next_worker = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._pending_jobs: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        self._limits: Optional[Dict[str, Any]] = None
+        self._limits_fetched_at = 0.0
 
         logger.info("agent_initialized", agent_id=self.agent_id)
 
@@ -115,8 +155,15 @@ class SalesforceAgent:
         self.auth.authenticate()
         logger.info("agent_authenticated", agent_id=self.agent_id)
 
+        # Pre-warm the limits cache so the first get_stats() doesn't pay a round trip
+        try:
+            self._get_limits()
+        except Exception as e:
+            logger.warning("limits_prefetch_failed", error=str(e))
+
         self._running = True
-        self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        self._start_event_loop()
+        self._start_workers()
 
         # Handle shutdown signals
         signal.signal(signal.SIGINT, self._handle_shutdown)
@@ -132,8 +179,8 @@ class SalesforceAgent:
         logger.info("agent_stopping", agent_id=self.agent_id)
         self._running = False
 
-        if self._executor:
-            self._executor.shutdown(wait=True)
+        self._stop_workers()
+        self._stop_event_loop()
 
         logger.info("agent_stopped", agent_id=self.agent_id)
 
@@ -150,44 +197,240 @@ class SalesforceAgent:
 
         while self._running:
             try:
-                # Get next task
-                task = self.queue.get_next(self.agent_id)
+                # Claim a batch of tasks per queue round trip
+                claim_size = max(self.config.max_workers * 2, self.config.coalesce_threshold)
+                tasks = self.queue.get_batch(self.agent_id, claim_size)
 
-                if task:
+                if tasks:
                     consecutive_empty = 0
-                    self._executor.submit(self._process_task, task)
+                    self._dispatch_batch(tasks)
                 else:
+                    # Adaptive polling: back off when queue is empty, with full jitter
+                    # so agents sharing the queue don't wake up together
+                    cap = min(self.config.poll_interval * 2 ** min(consecutive_empty, 6), 10)
                     consecutive_empty += 1
-                    # Adaptive polling: back off when queue is empty
-                    sleep_time = min(self.config.poll_interval * (1 + consecutive_empty * 0.1), 10)
-                    time.sleep(sleep_time)
+                    time.sleep(random.uniform(0, cap))
 
             except Exception as e:
                 logger.error("process_loop_error", error=str(e), agent_id=self.agent_id)
                 time.sleep(5)  # Back off on error
 
-    def _process_task(self, task: Task):
-        """Process a single task"""
-        logger.info("task_processing", task_id=task.id, operation=task.operation, sobject=task.sobject)
+    def _start_workers(self):
+        """Spawn worker threads, each draining its own queue"""
+        self._worker_queues = [SimpleQueue() for _ in range(self.config.max_workers)]
+        self._workers = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(work_queue,),
+                name=f"{self.agent_id}-worker-{i}",
+                daemon=True
+            )
+            for i, work_queue in enumerate(self._worker_queues)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _stop_workers(self):
+        """Signal workers to exit once their queues drain, then wait for them"""
+        # Detach the queues first so late dispatches hand tasks back instead of queueing behind the sentinel
+        work_queues, self._worker_queues = self._worker_queues, []
+        for work_queue in work_queues:
+            work_queue.put(None)
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join()
+        self._workers = []
+
+    def _start_event_loop(self):
+        """Run an asyncio loop in a background thread for async bulk jobs"""
+        self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"{self.agent_id}-loop",
+            daemon=True
+        )
+        self._loop_thread.start()
 
-        try:
-            handler = self._handlers.get(task.operation)
+    def _stop_event_loop(self):
+        """Wait for in-flight bulk jobs, then stop the event loop"""
+        if not self._loop:
+            return
+
+        with self._pending_lock:
+            pending = list(self._pending_jobs)
+        wait(pending)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+    def _dispatch_batch(self, tasks: List[Task]):
+        """Dispatch claimed tasks, coalescing same-sobject creates into one bulk job"""
+        threshold = self.config.coalesce_threshold
+        creates: Dict[str, List[Task]] = {}
+
+        for task in tasks:
+            if threshold and task.operation == "create":
+                creates.setdefault(task.sobject, []).append(task)
+            else:
+                self._dispatch(task)
+
+        for sobject, group in creates.items():
+            if len(group) >= threshold:
+                self._submit_coalesced_create(sobject, group)
+            else:
+                for task in group:
+                    self._dispatch(task)
+
+    def _dispatch(self, task: Task):
+        """Hand a task to the next worker (round-robin)"""
+        work_queues = self._worker_queues
+        if not work_queues:
+            # Claimed while the agent was stopping: return it to the queue rather than strand it processing
+            self.queue.fail(task.id, "Agent stopped before the task was dispatched")
+            return
+        index = self._next_worker % len(work_queues)
+        work_queues[index].put(task)
+        self._next_worker = index + 1
+
+    def _worker_loop(self, work_queue: SimpleQueue):
+        """Process tasks from a single worker's queue until a None sentinel arrives"""
+        while True:
+            task = work_queue.get()
+            if task is None:
+                break
+            # An idle worker claims its own next task while committing the last one
+            while task is not None:
+                task = self._process_task(task, claim_next=self._running and work_queue.empty())
+
+    def _process_task(self, task: Task, claim_next: bool = False) -> Optional[Task]:
+        """Process a single task, returning the next claimed task if `claim_next`"""
+        if self._log_sampled(task):
+            logger.info("task_processing", task_id=task.id, operation=task.operation, sobject=task.sobject)
+
+        # Sync operations are the common case: resolve them with a single lookup
+        handler = self._handlers.get(task.operation)
+
+        if handler is None:
+            async_handler = self._async_handlers.get(task.operation)
+            if async_handler:
+                self._submit_async_task(task, async_handler)
+                return None
 
+        try:
             if not handler:
                 raise ValueError(f"Unknown operation: {task.operation}")
 
             result = handler(task)
 
+            return self._complete_task(task, result, claim_next)
+
+        except Exception as e:
+            self._fail_task(task, e)
+            return None
+
+    def _submit_async_task(self, task: Task, handler: Callable[[Task], Awaitable[Dict[str, Any]]]):
+        """Schedule a coroutine task on the event loop; it reports its own outcome"""
+        def _on_done(done: Future):
+            try:
+                self._complete_task(task, done.result())
+            except Exception as e:
+                self._fail_task(task, e)
+
+        self._run_async(handler(task), _on_done)
+
+    def _submit_coalesced_create(self, sobject: str, tasks: List[Task]):
+        """Run many create tasks as one bulk insert job"""
+        if self._loop is None:
+            # Claimed while the agent was stopping: return them to the queue rather than strand them processing
+            self.queue.fail_many([(task.id, "Agent stopped before the task was dispatched") for task in tasks])
+            return
+
+        logger.info("tasks_coalesced", sobject=sobject, count=len(tasks))
+
+        def _on_done(done: Future):
+            try:
+                result = done.result()
+            except Exception as e:
+                self._fail_tasks([(task, e) for task in tasks], retry=not isinstance(e, BulkJobSubmittedError))
+                return
+            self._complete_coalesced(tasks, result)
+
+        self._run_async(self.bulk.insert_async(sobject, [task.data for task in tasks]), _on_done)
+
+    def _complete_coalesced(self, tasks: List[Task], result: BulkJobResult):
+        """Map bulk result rows back to the tasks that produced them"""
+        # Bulk API 2.0 doesn't preserve row order, but echoes the uploaded values;
+        # tasks with identical payloads are interchangeable
+        fieldnames = list(dict.fromkeys(key for task in tasks for key in task.data))
+        by_row: Dict[tuple, List[Task]] = {}
+        for task in tasks:
+            by_row.setdefault(_csv_row_key(task.data, fieldnames), []).append(task)
+
+        for row in result.successful_results:
+            matches = by_row.get(tuple(row.get(field, "") for field in fieldnames))
+            if matches:
+                self._complete_task(matches.pop(), {"id": row.get("sf__Id"), "success": True, "job_id": result.job_id})
+
+        failures: List[Tuple[Task, Exception]] = []
+        for row in result.failed_results:
+            matches = by_row.get(tuple(row.get(field, "") for field in fieldnames))
+            if matches:
+                failures.append((matches.pop(), BulkAPIError(row.get("sf__Error", "Bulk insert failed"))))
+        self._fail_tasks(failures)
+
+        # A task with no matching row may still have been created (e.g. Salesforce
+        # echoed a value in another format), so it fails without a retry
+        unmatched = [
+            (task, BulkAPIError(f"No result row for task in bulk job {result.job_id}"))
+            for matches in by_row.values()
+            for task in matches
+        ]
+        self._fail_tasks(unmatched, retry=False)
+
+    def _run_async(self, coro: Awaitable, on_done: Callable[[Future], None]):
+        """Schedule a coroutine on the event loop and track it until it finishes"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        with self._pending_lock:
+            self._pending_jobs.add(future)
+
+        def _on_done(done: Future):
+            with self._pending_lock:
+                self._pending_jobs.discard(done)
+            on_done(done)
+
+        future.add_done_callback(_on_done)
+
+    def _complete_task(self, task: Task, result: Dict[str, Any], claim_next: bool = False) -> Optional[Task]:
+        """Record a successful task, claiming the next one in the same round trip if `claim_next`"""
+        next_task = None
+        if claim_next:
+            next_task = self.queue.complete_and_get_next(task.id, result, self.agent_id)
+        else:
             self.queue.complete(task.id, result)
+        if self._log_sampled(task):
             logger.info("task_completed", task_id=task.id, operation=task.operation)
+        return next_task
 
-        except SalesforceAPIError as e:
-            logger.error("task_api_error", task_id=task.id, error=str(e), status_code=e.status_code)
-            self.queue.fail(task.id, str(e))
+    def _log_sampled(self, task: Task) -> bool:
+        """Whether this task's progress events are logged (keyed on id so events pair up)"""
+        return self.config.log_sample_rate <= 1 or hash(task.id) % self.config.log_sample_rate == 0
 
-        except Exception as e:
-            logger.error("task_error", task_id=task.id, error=str(e))
-            self.queue.fail(task.id, str(e))
+    def _fail_task(self, task: Task, error: Exception):
+        """Record a failed task (the queue retries it if possible)"""
+        if isinstance(error, SalesforceAPIError):
+            logger.error("task_api_error", task_id=task.id, error=str(error), status_code=error.status_code)
+        else:
+            logger.error("task_error", task_id=task.id, error=str(error))
+        # Once a bulk job's data is submitted, records may exist; retrying would duplicate them
+        self.queue.fail(task.id, str(error), retry=not isinstance(error, BulkJobSubmittedError))
+
+    def _fail_tasks(self, failures: List[Tuple[Task, Exception]], retry: bool = True):
+        """Record several failed tasks in one queue round trip (retried if possible, unless `retry` is False)"""
+        for task, error in failures:
+            logger.error("task_error", task_id=task.id, error=str(error))
+        self.queue.fail_many([(task.id, str(error)) for task, error in failures], retry=retry)
 
     # ==================== Operation Handlers ====================
 
@@ -198,15 +441,18 @@ class SalesforceAgent:
 
     def _handle_get(self, task: Task) -> Dict[str, Any]:
         """Handle get operation"""
-        record_id = task.data.get("id")
-        fields = task.data.get("fields")
+        data = task.data
+        record_id = data.get("id")
+        fields = data.get("fields")
         record = self.client.get(task.sobject, record_id, fields)
         return {"record": record, "success": True}
 
     def _handle_update(self, task: Task) -> Dict[str, Any]:
         """Handle update operation"""
-        record_id = task.data.pop("id")
-        self.client.update(task.sobject, record_id, task.data)
+        data = task.data
+        record_id = data["id"]
+        fields = {key: value for key, value in data.items() if key != "id"}
+        self.client.update(task.sobject, record_id, fields)
         return {"id": record_id, "success": True}
 
     def _handle_delete(self, task: Task) -> Dict[str, Any]:
@@ -217,15 +463,18 @@ class SalesforceAgent:
 
     def _handle_upsert(self, task: Task) -> Dict[str, Any]:
         """Handle upsert operation"""
-        external_id_field = task.data.pop("external_id_field")
-        external_id = task.data.pop("external_id")
-        record_id = self.client.upsert(task.sobject, external_id_field, external_id, task.data)
+        data = task.data
+        external_id_field = data["external_id_field"]
+        external_id = data["external_id"]
+        fields = {key: value for key, value in data.items() if key not in UPSERT_KEYS}
+        record_id = self.client.upsert(task.sobject, external_id_field, external_id, fields)
         return {"id": record_id, "success": True}
 
     def _handle_query(self, task: Task) -> Dict[str, Any]:
         """Handle query operation"""
-        soql = task.data.get("soql")
-        all_records = task.data.get("all", False)
+        data = task.data
+        soql = data.get("soql")
+        all_records = data.get("all", False)
 
         if all_records:
             records = self.client.query_all(soql)
@@ -235,22 +484,22 @@ class SalesforceAgent:
 
         return {"records": records, "count": len(records), "success": True}
 
-    def _handle_bulk_insert(self, task: Task) -> Dict[str, Any]:
+    async def _handle_bulk_insert(self, task: Task) -> Dict[str, Any]:
         """Handle bulk insert operation"""
         records = task.data.get("records", [])
-        result = self.bulk.insert(task.sobject, records)
+        result = await self.bulk.insert_async(task.sobject, records)
         return self._bulk_result_to_dict(result)
 
-    def _handle_bulk_update(self, task: Task) -> Dict[str, Any]:
+    async def _handle_bulk_update(self, task: Task) -> Dict[str, Any]:
         """Handle bulk update operation"""
         records = task.data.get("records", [])
-        result = self.bulk.update(task.sobject, records)
+        result = await self.bulk.update_async(task.sobject, records)
         return self._bulk_result_to_dict(result)
 
-    def _handle_bulk_delete(self, task: Task) -> Dict[str, Any]:
+    async def _handle_bulk_delete(self, task: Task) -> Dict[str, Any]:
         """Handle bulk delete operation"""
         record_ids = task.data.get("ids", [])
-        result = self.bulk.delete(task.sobject, record_ids)
+        result = await self.bulk.delete_async(task.sobject, record_ids)
         return self._bulk_result_to_dict(result)
 
     def _bulk_result_to_dict(self, result: BulkJobResult) -> Dict[str, Any]:
@@ -313,7 +562,7 @@ class SalesforceAgent:
         queue_stats = self.queue.stats()
 
         try:
-            limits = self.client.get_limits()
+            limits = self._get_limits()
             api_usage = {
                 "daily_api_requests": limits.get("DailyApiRequests", {}),
                 "bulk_api_requests": limits.get("DailyBulkApiRequests", {}),
@@ -327,3 +576,11 @@ class SalesforceAgent:
             "queue": queue_stats,
             "api_usage": api_usage
         }
+
+    def _get_limits(self) -> Dict[str, Any]:
+        """Get org limits, cached for LIMITS_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._limits is None or now - self._limits_fetched_at > LIMITS_CACHE_TTL:
+            self._limits = self.client.get_limits()
+            self._limits_fetched_at = now
+        return self._limits
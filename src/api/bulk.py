@@ -6,18 +6,74 @@ Essential for autonomous agent swarms processing at scale.
 """
 
 import time
+import random
+import asyncio
 import csv
 import io
-from typing import List, Dict, Any, Optional
+import threading
+import operator
+import zlib
+from itertools import chain, islice
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional
 from enum import Enum
 from dataclasses import dataclass
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import structlog
 
-from ..auth.oauth import SalesforceAuth
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # optional accelerator for large result sets
+    pa = None
+    pacsv = None
+
+from ..auth.oauth import SalesforceAuth, TokenInfo
 
 logger = structlog.get_logger()
 
+# Target size of each CSV chunk streamed to the upload endpoint
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Records per Bulk API query result page (maxRecords)
+QUERY_PAGE_SIZE = 250_000
+
+# Socket read size when downloading result sets
+RESULT_READ_SIZE = 1024 * 1024
+
+# Result bodies at least this large are parsed with pyarrow when available
+ARROW_PARSE_THRESHOLD = 1024 * 1024
+
+# Rows handed to csv.writer.writerows per call while filling a chunk
+CSV_WRITE_BATCH = 256
+
+# Uploads at least this large are gzip-compressed; level 1 keeps ahead of the network
+GZIP_MIN_SIZE = 16 * 1024
+GZIP_LEVEL = 1
+
+# Static parts of the job create payload
+CREATE_JOB_DEFAULTS = {"contentType": "CSV", "lineEnding": "LF"}
+
+# Pre-encoded job state transitions
+UPLOAD_COMPLETE_BODY = b'{"state": "UploadComplete"}'
+ABORTED_BODY = b'{"state": "Aborted"}'
+
+# Per-request headers merged over the session's Authorization header
+JSON_HEADERS = {'Content-Type': 'application/json'}
+CSV_UPLOAD_HEADERS = {'Content-Type': 'text/csv'}
+CSV_GZIP_UPLOAD_HEADERS = {'Content-Type': 'text/csv', 'Content-Encoding': 'gzip'}
+CSV_RESULT_HEADERS = {'Accept': 'text/csv'}
+
+# Job status polling backoff (seconds)
+POLL_BACKOFF_BASE = 1.0
+POLL_BACKOFF_CAP = 30.0
+
+# (connect, read) timeout for job status requests; one hung poll stalls every watched job
+STATUS_REQUEST_TIMEOUT = (3.05, 30)
+
 
 class BulkOperation(Enum):
     INSERT = "insert"
@@ -36,6 +92,9 @@ class JobState(Enum):
     FAILED = "Failed"
 
 
+TERMINAL_STATES = frozenset({JobState.JOB_COMPLETE, JobState.FAILED, JobState.ABORTED})
+
+
 @dataclass
 class BulkJobResult:
     """Result of a bulk job"""
@@ -48,6 +107,124 @@ class BulkJobResult:
     processing_time_ms: int
 
 
+def _poll_delay(attempt: int) -> float:
+    """Capped exponential backoff with full jitter, so swarm agents don't poll in lockstep"""
+    return random.uniform(0, min(POLL_BACKOFF_CAP, POLL_BACKOFF_BASE * 2 ** min(attempt, 6)))
+
+
+@dataclass
+class _WatchedJob:
+    """Polling schedule for one in-flight job"""
+    future: Future
+    get_state: Callable[[str], JobState]
+    deadline: float
+    timeout: int
+    next_poll: float = 0.0
+    attempt: int = 0
+
+
+class BulkPoller:
+    """
+    Watches in-flight bulk jobs from a single background thread.
+
+    Each job keeps its own jittered backoff schedule; callers get a Future
+    that resolves to the job's terminal state. Threads blocked on polling
+    drop from one per job to one per client.
+    """
+
+    def __init__(self, get_state: Callable[[str], JobState]):
+        self._get_state = get_state
+        self._jobs: Dict[str, _WatchedJob] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(
+        self,
+        job_id: str,
+        timeout: int = 600,
+        get_state: Optional[Callable[[str], JobState]] = None
+    ) -> Future:
+        """Start watching a job; the returned Future resolves to its terminal JobState"""
+        now = time.monotonic()
+        job = _WatchedJob(
+            future=Future(),
+            get_state=get_state or self._get_state,
+            deadline=now + timeout,
+            timeout=timeout,
+            next_poll=now
+        )
+
+        with self._cond:
+            self._jobs[job_id] = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bulk-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+        return job.future
+
+    def _run(self):
+        """Poll jobs as they come due"""
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+
+                now = time.monotonic()
+                due = [(job_id, job) for job_id, job in self._jobs.items() if job.next_poll <= now]
+
+                if not due:
+                    self._cond.wait(min(job.next_poll for job in self._jobs.values()) - now)
+                    continue
+
+            for job_id, job in due:
+                try:
+                    self._check(job_id, job)
+                except Exception as e:
+                    # This thread polls every job, so it must outlive any one of them
+                    logger.error("bulk_poll_failed", job_id=job_id, error=str(e))
+                    self._forget(job_id)
+                    _settle(job.future, exception=e)
+
+    def _check(self, job_id: str, job: _WatchedJob):
+        """Poll one job and resolve or reschedule it"""
+        if job.future.cancelled():
+            self._forget(job_id)
+            return
+
+        try:
+            state = job.get_state(job_id)
+        except Exception as e:
+            self._forget(job_id)
+            _settle(job.future, exception=e)
+            return
+
+        if state in TERMINAL_STATES:
+            self._forget(job_id)
+            _settle(job.future, result=state)
+        elif time.monotonic() > job.deadline:
+            self._forget(job_id)
+            _settle(job.future, exception=BulkAPIError(f"Job timed out after {job.timeout}s"))
+        else:
+            job.next_poll = time.monotonic() + _poll_delay(job.attempt)
+            job.attempt += 1
+
+    def _forget(self, job_id: str):
+        with self._cond:
+            self._jobs.pop(job_id, None)
+
+
+def _settle(future: Future, result: Any = None, exception: Optional[BaseException] = None):
+    """Resolve a watched job's future unless its caller cancelled it since the last check"""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
 class BulkClient:
     """
     Salesforce Bulk API 2.0 client.
@@ -60,20 +237,49 @@ class BulkClient:
 
     API_VERSION = "v59.0"
 
+    # Connection pool sizing for the shared keep-alive session
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+
     def __init__(self, auth: SalesforceAuth):
         self.auth = auth
         self._session = requests.Session()
 
+        # Only GETs (status polls, result downloads) are safe to retry transparently;
+        # the streamed upload body cannot be replayed
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retries
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # One thread polls every in-flight job for this client
+        self._poller = BulkPoller(self._get_job_state)
+
+        # Authorization lives on the session and is re-synced on every token change
+        if auth is not None:
+            auth.add_token_listener(self._on_token)
+
     @property
     def base_url(self) -> str:
         return f"{self.auth.token.instance_url}/services/data/{self.API_VERSION}/jobs/ingest"
 
     @property
-    def headers(self) -> dict:
-        return {
-            **self.auth.headers,
-            'Content-Type': 'application/json'
-        }
+    def query_url(self) -> str:
+        return f"{self.auth.token.instance_url}/services/data/{self.API_VERSION}/jobs/query"
+
+    def _on_token(self, token: TokenInfo):
+        """Update the session's Authorization header for a new token"""
+        self._session.headers['Authorization'] = f'Bearer {token.access_token}'
 
     def insert(self, sobject: str, records: List[Dict[str, Any]]) -> BulkJobResult:
         """Insert records in bulk"""
@@ -92,6 +298,112 @@ class BulkClient:
         records = [{"Id": rid} for rid in record_ids]
         return self._execute_job(sobject, BulkOperation.DELETE, records)
 
+    def query(self, soql: str, page_size: int = QUERY_PAGE_SIZE, timeout: int = 3600) -> List[Dict[str, Any]]:
+        """
+        Run a SOQL query as a Bulk API 2.0 query job.
+
+        Salesforce chunks large extracts server-side (by primary key) and the
+        client only downloads the finished result pages. Values come back as
+        CSV strings, with relationship fields flattened (e.g. "Account.Name").
+        """
+        start_time = time.time()
+        job_id = self._create_query_job(soql)
+        logger.info("bulk_query_created", job_id=job_id)
+
+        try:
+            state = self._poller.watch(job_id, timeout, get_state=self._get_query_job_state).result()
+            if state != JobState.JOB_COMPLETE:
+                raise BulkAPIError(f"Query job {job_id} ended in state {state.value}")
+
+            records = self._get_query_results(job_id, page_size)
+
+        except Exception:
+            try:
+                self._session.patch(f"{self.query_url}/{job_id}", headers=JSON_HEADERS, data=ABORTED_BODY)
+            except Exception:
+                pass
+            raise
+
+        logger.info(
+            "bulk_query_complete",
+            job_id=job_id,
+            records=len(records),
+            time_ms=int((time.time() - start_time) * 1000)
+        )
+        return records
+
+    # ==================== Async Operations ====================
+    #
+    # Same job lifecycle, but status polling sleeps on the event loop instead of
+    # blocking a thread, so one loop can supervise many concurrent jobs.
+
+    async def insert_async(self, sobject: str, records: List[Dict[str, Any]]) -> BulkJobResult:
+        """Insert records in bulk"""
+        return await self._execute_job_async(sobject, BulkOperation.INSERT, records)
+
+    async def update_async(self, sobject: str, records: List[Dict[str, Any]]) -> BulkJobResult:
+        """Update records in bulk (must include Id field)"""
+        return await self._execute_job_async(sobject, BulkOperation.UPDATE, records)
+
+    async def upsert_async(self, sobject: str, external_id_field: str, records: List[Dict[str, Any]]) -> BulkJobResult:
+        """Upsert records in bulk using external ID"""
+        return await self._execute_job_async(sobject, BulkOperation.UPSERT, records, external_id_field)
+
+    async def delete_async(self, sobject: str, record_ids: List[str]) -> BulkJobResult:
+        """Delete records in bulk"""
+        records = [{"Id": rid} for rid in record_ids]
+        return await self._execute_job_async(sobject, BulkOperation.DELETE, records)
+
+    # ==================== Fire-and-Forget Jobs ====================
+
+    def submit(
+        self,
+        sobject: str,
+        operation: BulkOperation,
+        records: List[Dict[str, Any]],
+        external_id_field: Optional[str] = None
+    ) -> str:
+        """
+        Create a job and upload its data without waiting for processing.
+
+        Returns the job ID; use watch() to learn when it finishes and
+        get_job_info() for its record counts.
+        """
+        job_id = self._create_job(sobject, operation, external_id_field)
+        logger.info("bulk_job_created", job_id=job_id, sobject=sobject, operation=operation.value)
+
+        try:
+            self._submit_job_data(job_id, records)
+        except Exception:
+            self._abort_job_quietly(job_id)
+            raise
+
+        return job_id
+
+    def watch(self, job_id: str, timeout: int = 600) -> Future:
+        """Get a Future that resolves to the job's terminal JobState"""
+        return self._poller.watch(job_id, timeout)
+
+    def get_job_info(self, job_id: str) -> Dict[str, Any]:
+        """Fetch the job's info (state, numberRecordsProcessed, numberRecordsFailed, ...)"""
+        response = self._session.get(f"{self.base_url}/{job_id}", timeout=STATUS_REQUEST_TIMEOUT)
+
+        if response.status_code != 200:
+            raise BulkAPIError(f"Failed to get job info: {response.text}")
+
+        return orjson.loads(response.content)
+
+    def abort_job(self, job_id: str):
+        """Abort a submitted job so it stops processing records"""
+        response = self._session.patch(
+            f"{self.base_url}/{job_id}", headers=JSON_HEADERS, data=ABORTED_BODY, timeout=STATUS_REQUEST_TIMEOUT
+        )
+
+        if response.status_code != 200:
+            raise BulkAPIError(f"Failed to abort job: {response.text}")
+
+    # ==================== Job Lifecycle ====================
+
     def _execute_job(
         self,
         sobject: str,
@@ -107,48 +419,89 @@ class BulkClient:
         logger.info("bulk_job_created", job_id=job_id, sobject=sobject, operation=operation.value)
 
         try:
-            # 2. Upload data
-            self._upload_data(job_id, records)
-            logger.info("bulk_data_uploaded", job_id=job_id, record_count=len(records))
-
-            # 3. Close job to start processing
-            self._close_job(job_id)
+            # 2. Upload data and close job to start processing
+            self._submit_job_data(job_id, records)
+        except Exception:
+            self._abort_job_quietly(job_id)
+            raise
 
-            # 4. Poll until complete
+        try:
+            # 3. Poll until complete
             final_state = self._poll_job_status(job_id)
 
-            # 5. Get results
-            successful, failed = self._get_results(job_id)
+            # 4. Get results
+            return self._build_result(job_id, final_state, len(records), start_time)
 
-            processing_time = int((time.time() - start_time) * 1000)
+        except Exception as e:
+            self._abort_job_quietly(job_id)
+            raise BulkJobSubmittedError(job_id, e) from e
 
-            result = BulkJobResult(
-                job_id=job_id,
-                state=final_state,
-                records_processed=len(records),
-                records_failed=len(failed),
-                successful_results=successful,
-                failed_results=failed,
-                processing_time_ms=processing_time
-            )
+    async def _execute_job_async(
+        self,
+        sobject: str,
+        operation: BulkOperation,
+        records: List[Dict[str, Any]],
+        external_id_field: Optional[str] = None
+    ) -> BulkJobResult:
+        """Execute a complete bulk job without holding a thread while it processes"""
+        start_time = time.time()
 
-            logger.info(
-                "bulk_job_complete",
-                job_id=job_id,
-                processed=result.records_processed,
-                failed=result.records_failed,
-                time_ms=processing_time
-            )
+        # Blocking HTTP calls run in the loop's default executor
+        job_id = await asyncio.to_thread(self._create_job, sobject, operation, external_id_field)
+        logger.info("bulk_job_created", job_id=job_id, sobject=sobject, operation=operation.value)
 
-            return result
+        try:
+            await asyncio.to_thread(self._submit_job_data, job_id, records)
+        except Exception:
+            await asyncio.to_thread(self._abort_job_quietly, job_id)
+            raise
+
+        try:
+            final_state = await self._poll_job_status_async(job_id)
+            return await asyncio.to_thread(self._build_result, job_id, final_state, len(records), start_time)
 
         except Exception as e:
-            # Abort job on error
-            try:
-                self._abort_job(job_id)
-            except:
-                pass
-            raise
+            await asyncio.to_thread(self._abort_job_quietly, job_id)
+            raise BulkJobSubmittedError(job_id, e) from e
+
+    def _submit_job_data(self, job_id: str, records: List[Dict[str, Any]]):
+        """Upload data and close the job to start processing"""
+        self._upload_data(job_id, records)
+        logger.info("bulk_data_uploaded", job_id=job_id, record_count=len(records))
+        self._close_job(job_id)
+
+    def _build_result(self, job_id: str, final_state: JobState, record_count: int, start_time: float) -> BulkJobResult:
+        """Download results and assemble the job result"""
+        successful, failed = self._get_results(job_id)
+
+        processing_time = int((time.time() - start_time) * 1000)
+
+        result = BulkJobResult(
+            job_id=job_id,
+            state=final_state,
+            records_processed=record_count,
+            records_failed=len(failed),
+            successful_results=successful,
+            failed_results=failed,
+            processing_time_ms=processing_time
+        )
+
+        logger.info(
+            "bulk_job_complete",
+            job_id=job_id,
+            processed=result.records_processed,
+            failed=result.records_failed,
+            time_ms=processing_time
+        )
+
+        return result
+
+    def _abort_job_quietly(self, job_id: str):
+        """Abort job on error, ignoring failures"""
+        try:
+            self._abort_job(job_id)
+        except Exception:
+            pass
 
     def _create_job(
         self,
@@ -158,33 +511,36 @@ class BulkClient:
     ) -> str:
         """Create a bulk job"""
         payload = {
+            **CREATE_JOB_DEFAULTS,
             "object": sobject,
-            "operation": operation.value,
-            "contentType": "CSV",
-            "lineEnding": "LF"
+            "operation": operation.value
         }
 
         if external_id_field:
             payload["externalIdFieldName"] = external_id_field
 
-        response = self._session.post(self.base_url, headers=self.headers, json=payload)
+        response = self._session.post(self.base_url, headers=JSON_HEADERS, data=orjson.dumps(payload))
 
         if response.status_code == 200:
-            return response.json()["id"]
+            return orjson.loads(response.content)["id"]
         else:
             raise BulkAPIError(f"Failed to create job: {response.text}")
 
     def _upload_data(self, job_id: str, records: List[Dict[str, Any]]):
-        """Upload CSV data to the job"""
-        # Convert to CSV
-        csv_data = self._records_to_csv(records)
+        """Upload CSV data to the job (streamed with chunked transfer-encoding)"""
+        # Serialize lazily so CSV encoding overlaps with the socket send
+        chunks = self._records_to_csv(records)
 
-        url = f"{self.base_url}/{job_id}/batches"
-        headers = {
-            'Authorization': self.auth.headers['Authorization'],
-            'Content-Type': 'text/csv'
-        }
+        # A first chunk below the threshold is the whole payload; don't bother compressing it
+        first = next(chunks, b"")
+        csv_data = chain((first,), chunks)
+        headers = CSV_UPLOAD_HEADERS
 
+        if len(first) >= GZIP_MIN_SIZE:
+            csv_data = _gzip_stream(csv_data)
+            headers = CSV_GZIP_UPLOAD_HEADERS
+
+        url = f"{self.base_url}/{job_id}/batches"
         response = self._session.put(url, headers=headers, data=csv_data)
 
         if response.status_code != 201:
@@ -193,86 +549,230 @@ class BulkClient:
     def _close_job(self, job_id: str):
         """Close job to start processing"""
         url = f"{self.base_url}/{job_id}"
-        payload = {"state": "UploadComplete"}
 
-        response = self._session.patch(url, headers=self.headers, json=payload)
+        response = self._session.patch(url, headers=JSON_HEADERS, data=UPLOAD_COMPLETE_BODY)
 
         if response.status_code != 200:
             raise BulkAPIError(f"Failed to close job: {response.text}")
 
-    def _abort_job(self, job_id: str):
-        """Abort a job"""
-        url = f"{self.base_url}/{job_id}"
-        payload = {"state": "Aborted"}
+    def _create_query_job(self, soql: str) -> str:
+        """Create a bulk query job"""
+        payload = {**CREATE_JOB_DEFAULTS, "operation": "query", "query": soql}
 
-        self._session.patch(url, headers=self.headers, json=payload)
+        response = self._session.post(self.query_url, headers=JSON_HEADERS, data=orjson.dumps(payload))
 
-    def _poll_job_status(self, job_id: str, timeout: int = 600) -> JobState:
-        """Poll job status until complete"""
-        url = f"{self.base_url}/{job_id}"
-        start_time = time.time()
+        if response.status_code == 200:
+            return orjson.loads(response.content)["id"]
+        else:
+            raise BulkAPIError(f"Failed to create query job: {response.text}")
+
+    def _get_query_job_state(self, job_id: str) -> JobState:
+        """Fetch the current query job state"""
+        url = f"{self.query_url}/{job_id}"
+
+        response = self._session.get(url, timeout=STATUS_REQUEST_TIMEOUT)
+
+        if response.status_code != 200:
+            raise BulkAPIError(f"Failed to get query job status: {response.text}")
 
+        return JobState(orjson.loads(response.content)["state"])
+
+    def _get_query_results(self, job_id: str, page_size: int) -> List[Dict[str, Any]]:
+        """Download every result page of a finished query job"""
+        url = f"{self.query_url}/{job_id}/results"
+        records: List[Dict[str, Any]] = []
+        locator = None
+
+        # Each page names the next through Sforce-Locator ("null" on the last page)
         while True:
-            response = self._session.get(url, headers=self.headers)
+            params = {"maxRecords": page_size}
+            if locator:
+                params["locator"] = locator
 
-            if response.status_code != 200:
-                raise BulkAPIError(f"Failed to get job status: {response.text}")
+            with self._session.get(url, headers=CSV_RESULT_HEADERS, params=params, stream=True) as response:
+                if response.status_code != 200:
+                    raise BulkAPIError(f"Failed to get query results: {response.text}")
+
+                records.extend(self._stream_to_records(response))
+                locator = response.headers.get("Sforce-Locator")
+
+            if not locator or locator == "null":
+                return records
 
-            data = response.json()
-            state = JobState(data["state"])
+    def _abort_job(self, job_id: str):
+        """Abort a job"""
+        url = f"{self.base_url}/{job_id}"
 
-            if state in (JobState.JOB_COMPLETE, JobState.FAILED, JobState.ABORTED):
-                return state
+        self._session.patch(url, headers=JSON_HEADERS, data=ABORTED_BODY)
+
+    def _poll_job_status(self, job_id: str, timeout: int = 600) -> JobState:
+        """Wait for a job to finish (polled by the shared BulkPoller)"""
+        return self._poller.watch(job_id, timeout).result()
 
-            if time.time() - start_time > timeout:
-                raise BulkAPIError(f"Job timed out after {timeout}s")
+    async def _poll_job_status_async(self, job_id: str, timeout: int = 600) -> JobState:
+        """Wait for a job to finish without blocking the event loop"""
+        return await asyncio.wrap_future(self._poller.watch(job_id, timeout))
 
-            # Exponential backoff: 1s, 2s, 4s, max 30s
-            elapsed = time.time() - start_time
-            sleep_time = min(30, 2 ** (elapsed // 10))
-            time.sleep(sleep_time)
+    def _get_job_state(self, job_id: str) -> JobState:
+        """Fetch the current job state"""
+        return JobState(self.get_job_info(job_id)["state"])
 
     def _get_results(self, job_id: str) -> tuple:
-        """Get successful and failed results"""
-        successful = self._get_result_set(job_id, "successfulResults")
-        failed = self._get_result_set(job_id, "failedResults")
-        return successful, failed
+        """Get successful and failed results (downloaded concurrently)"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            successful = executor.submit(self._get_result_set, job_id, "successfulResults")
+            failed = executor.submit(self._get_result_set, job_id, "failedResults")
+            return successful.result(), failed.result()
 
     def _get_result_set(self, job_id: str, result_type: str) -> List[Dict[str, Any]]:
         """Get a specific result set"""
         url = f"{self.base_url}/{job_id}/{result_type}"
-        headers = {
-            'Authorization': self.auth.headers['Authorization'],
-            'Accept': 'text/csv'
-        }
-
-        response = self._session.get(url, headers=headers)
-
-        if response.status_code != 200:
-            return []
+        with self._session.get(url, headers=CSV_RESULT_HEADERS, stream=True) as response:
+            if response.status_code != 200:
+                raise BulkAPIError(f"Failed to get {result_type}: {response.text}")
+
+            content_length = int(response.headers.get('Content-Length', 0))
+            if pacsv is not None and content_length >= ARROW_PARSE_THRESHOLD:
+                # pyarrow parses the raw bytes from one buffer; large reads amortize syscalls
+                body = b"".join(response.iter_content(RESULT_READ_SIZE))
+                if not body or body.isspace():
+                    return []
+                return self._csv_to_records_arrow(body)
+
+            return self._stream_to_records(response)
+
+    def _stream_to_records(self, response: requests.Response) -> List[Dict[str, Any]]:
+        """Parse CSV records straight off the socket without buffering the body"""
+        # Let urllib3 undo any gzip Content-Encoding as it reads, and keep the
+        # stream open at EOF so the io wrappers can finish (the caller closes it)
+        response.raw.decode_content = True
+        response.raw.auto_close = False
+        stream = io.TextIOWrapper(
+            io.BufferedReader(response.raw, buffer_size=RESULT_READ_SIZE),
+            encoding="utf-8",
+            newline=""
+        )
+        return list(csv.DictReader(stream))
+
+    def _records_to_csv(self, records: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """Convert records to an iterator of CSV byte chunks"""
+        if not records:
+            return iter(())
 
-        return self._csv_to_records(response.text)
+        first_keys = records[0].keys()
+        uniform = all(record.keys() == first_keys for record in records)
 
-    def _records_to_csv(self, records: List[Dict[str, Any]]) -> str:
-        """Convert records to CSV string"""
-        if not records:
-            return ""
+        if uniform:
+            fieldnames = list(first_keys)
+        else:
+            # Union of keys across all records, in first-seen order
+            fieldnames = list(dict.fromkeys(key for record in records for key in record))
 
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=records[0].keys())
-        writer.writeheader()
-        writer.writerows(records)
-        return output.getvalue()
+        return _CsvChunkIterator(records, fieldnames, uniform=uniform)
 
     def _csv_to_records(self, csv_text: str) -> List[Dict[str, Any]]:
         """Convert CSV string to records"""
         if not csv_text.strip():
             return []
 
+        if pacsv is not None and len(csv_text) >= ARROW_PARSE_THRESHOLD:
+            return self._csv_to_records_arrow(csv_text.encode("utf-8"))
+
         reader = csv.DictReader(io.StringIO(csv_text))
         return list(reader)
 
+    def _csv_to_records_arrow(self, csv_bytes: bytes) -> List[Dict[str, Any]]:
+        """Convert UTF-8 CSV bytes to records using pyarrow's multithreaded C++ parser"""
+        # Read every column as a string so results match csv.DictReader; only the header row is decoded here
+        fieldnames = next(csv.reader(io.TextIOWrapper(io.BytesIO(csv_bytes), encoding="utf-8", newline="")))
+        table = pacsv.read_csv(
+            pa.py_buffer(csv_bytes),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in fieldnames},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False
+            )
+        )
+        return table.to_pylist()
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip-compress a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class _CsvChunkIterator:
+    """
+    Lazily serializes records to CSV, yielding ~chunk_size byte chunks.
+
+    Passed as ``data=`` to requests so the body is streamed with
+    ``Transfer-Encoding: chunked`` instead of being built up front.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Dict[str, Any]],
+        fieldnames: List[str],
+        chunk_size: int = CSV_CHUNK_SIZE,
+        uniform: bool = False
+    ):
+        self._chunk_size = chunk_size
+        self._buffer = io.StringIO()
+        # Jobs are created with lineEnding=LF
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._writer.writerow(fieldnames)
+        self._rows = map(self._row_getter(fieldnames, uniform), records)
+        self._exhausted = False
+
+    @staticmethod
+    def _row_getter(fieldnames: List[str], uniform: bool):
+        """Build a record -> row tuple callable for the given fields"""
+        if not uniform or not fieldnames:
+            # Records may be missing fields; fill the gaps with empty values
+            return lambda record: tuple(record.get(field, "") for field in fieldnames)
+        if len(fieldnames) == 1:
+            field = fieldnames[0]
+            return lambda record: (record[field],)
+        # Single C-level multi-key fetch per row
+        return operator.itemgetter(*fieldnames)
+
+    def __iter__(self) -> "_CsvChunkIterator":
+        return self
+
+    def __next__(self) -> bytes:
+        if self._exhausted:
+            raise StopIteration
+
+        while self._buffer.tell() < self._chunk_size:
+            written = self._buffer.tell()
+            self._writer.writerows(islice(self._rows, CSV_WRITE_BATCH))
+            if self._buffer.tell() == written:
+                self._exhausted = True
+                break
+
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+
+        if not chunk:
+            raise StopIteration
+        return chunk.encode("utf-8")
+
 
 class BulkAPIError(Exception):
     """Bulk API error"""
     pass
+
+
+class BulkJobSubmittedError(BulkAPIError):
+    """A job failed after its data was submitted, so some records may already be processed"""
+
+    def __init__(self, job_id: str, cause: Exception):
+        super().__init__(f"Bulk job {job_id} failed after its data was submitted: {cause}")
+        self.job_id = job_id
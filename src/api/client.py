@@ -8,17 +8,83 @@ Core client for all Salesforce operations:
 - Metadata operations
 """
 
-import json
+import os
+import re
+import gzip
+import time
+import logging
+import orjson
 import requests
-from typing import Any, Dict, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from pathlib import Path
+from urllib.parse import urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from tenacity import retry, stop_after_attempt, wait_exponential
 import structlog
 
-from ..auth.oauth import SalesforceAuth
+from ..auth.oauth import SalesforceAuth, TokenInfo
+from .bulk import BulkClient, GZIP_LEVEL
 
 logger = structlog.get_logger()
 
+# Stdlib logger behind structlog's LoggerFactory; per-record events are skipped when INFO is filtered
+_stdlib_logger = logging.getLogger(__name__)
+
+# Success status codes per kind of REST call
+OK = frozenset({200})
+OK_CREATE = frozenset({201})
+OK_NO_CONTENT = frozenset({204})
+OK_UPSERT = frozenset({200, 201, 204})
+
+# Status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Status codes meaning Salesforce rejected the request unprocessed, so even a
+# record-creating POST can be resent without risking a duplicate
+REJECTED_STATUS = frozenset({429})
+
+# (connect, read) timeout for REST calls
+REQUEST_TIMEOUT = (3.05, 120)
+
+# Seconds to wait before each retry of a transient failure (3 attempts in all)
+RETRY_BACKOFF = (1.0, 2.0)
+
+# Records per /composite/sobjects request (Salesforce maximum)
+COLLECTION_MAX = 200
+
+# JSON request bodies at least this large are sent gzip-compressed
+REQUEST_GZIP_MIN_SIZE = 4 * 1024
+
+# Seconds a describe() result is reused (in memory and on disk)
+DESCRIBE_CACHE_TTL = 24 * 3600
+
+# Subrequests per /composite/batch request (Salesforce maximum)
+COMPOSITE_BATCH_MAX = 25
+
+# SOQL with an explicit row limit is never routed to a bulk query job
+SOQL_LIMIT = re.compile(r'\bLIMIT\s+\d+', re.IGNORECASE)
+
+# Top-level nextRecordsUrl in a /query response (precedes the records array)
+NEXT_RECORDS_URL = re.compile(rb'"nextRecordsUrl"\s*:\s*"([^"]+)"')
+
+
+def _failed_to_connect(error: requests.RequestException) -> bool:
+    """Whether a request failed before reaching Salesforce (so nothing was processed)"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _peek_next_records_url(content: bytes) -> Optional[str]:
+    """Find the next page URL without decoding the whole page"""
+    # Child relationship subqueries carry their own nextRecordsUrl inside records
+    head_end = content.find(b'"records"')
+    match = NEXT_RECORDS_URL.search(content, 0, head_end if head_end >= 0 else len(content))
+    return match.group(1).decode() if match else None
+
 
 @dataclass
 class QueryResult:
@@ -28,6 +94,17 @@ class QueryResult:
     records: List[Dict[str, Any]]
     next_records_url: Optional[str] = None
 
+    @classmethod
+    def from_json(cls, content: bytes) -> 'QueryResult':
+        """Build a QueryResult straight from a /query response body"""
+        data = orjson.loads(content)
+        return cls(
+            total_size=data['totalSize'],
+            done=data['done'],
+            records=data['records'],
+            next_records_url=data.get('nextRecordsUrl')
+        )
+
 
 class SalesforceClient:
     """
@@ -39,23 +116,101 @@ class SalesforceClient:
 
     API_VERSION = "v59.0"
 
-    def __init__(self, auth: SalesforceAuth):
+    # Connection pool sizing for the shared keep-alive session
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 32
+
+    def __init__(self, auth: SalesforceAuth, describe_cache_dir: Optional[str] = "~/.blackroad/describe"):
         self.auth = auth
         self._session = requests.Session()
 
+        # describe() results by (base URL, sobject); the disk cache survives restarts (None disables it)
+        self._describes: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._describe_cache_dir = Path(describe_cache_dir).expanduser() if describe_cache_dir else None
+
+        # Retries are handled per call by _send, so the adapter doesn't retry
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=0
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Created on first use by query_bulk()
+        self._bulk: Optional[BulkClient] = None
+
+        # Rebuilt only when the token (and so possibly the instance) changes
+        self._base_url: Optional[str] = None
+        self._instance_url: Optional[str] = None
+        self._sobject_urls: Dict[str, str] = {}
+        if auth is not None:
+            auth.add_token_listener(self._on_token)
+
     @property
     def base_url(self) -> str:
         """Get base URL for API requests"""
-        return f"{self.auth.token.instance_url}/services/data/{self.API_VERSION}"
+        if self._base_url is None:
+            self._on_token(self.auth.token)
+        return self._base_url
+
+    def _on_token(self, token: TokenInfo):
+        """Cache the instance and base URLs for a new token"""
+        self._instance_url = token.instance_url
+        self._base_url = f"{token.instance_url}/services/data/{self.API_VERSION}"
+        self._sobject_urls = {}
+
+    def _sobject_url(self, sobject: str) -> str:
+        """Get the cached /sobjects/{sobject} URL"""
+        url = self._sobject_urls.get(sobject)
+        if url is None:
+            url = self._sobject_urls[sobject] = f"{self.base_url}/sobjects/{sobject}"
+        return url
 
     @property
     def headers(self) -> dict:
         """Get headers for API requests"""
         return self.auth.headers
 
+    def _send(self, method: str, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying rate limits, 5xx responses and connection errors.
+
+        Requests that aren't idempotent (record creation) are only retried after a
+        429 or a failure to connect: after a 5xx or a timeout Salesforce may have
+        created the record, and resending it would create a duplicate. PATCH
+        updates and upserts name their record, so repeating them is safe.
+
+        Other responses, including 4xx errors, are returned after one attempt.
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        retry_status = RETRYABLE_STATUS if idempotent else REJECTED_STATUS
+
+        for delay in RETRY_BACKOFF:
+            try:
+                response = self._session.request(method, url, headers=self.headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not idempotent and not _failed_to_connect(e):
+                    raise
+                logger.warning("request_retry", method=method, error=str(e))
+            else:
+                if response.status_code not in retry_status:
+                    return response
+                logger.warning("request_retry", method=method, status_code=response.status_code)
+            time.sleep(delay)
+
+        return self._session.request(method, url, headers=self.headers, **kwargs)
+
+    def _encode_body(self, payload: Any) -> Tuple[bytes, dict]:
+        """Serialize a JSON request body, gzipping large ones"""
+        body = orjson.dumps(payload)
+        if len(body) < REQUEST_GZIP_MIN_SIZE:
+            return body, self.headers
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), {**self.headers, 'Content-Encoding': 'gzip'}
+
     # ==================== CRUD Operations ====================
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     def create(self, sobject: str, data: Dict[str, Any]) -> str:
         """
         Create a new record.
@@ -67,18 +222,18 @@ class SalesforceClient:
         Returns:
             ID of the created record
         """
-        url = f"{self.base_url}/sobjects/{sobject}"
+        url = self._sobject_url(sobject)
 
-        response = self._session.post(url, headers=self.headers, json=data)
+        response = self._send("POST", url, idempotent=False, data=orjson.dumps(data))
 
-        if response.status_code == 201:
-            result = response.json()
-            logger.info("record_created", sobject=sobject, id=result['id'])
-            return result['id']
-        else:
+        if response.status_code not in OK_CREATE:
             self._handle_error(response, "create", sobject)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+        result = orjson.loads(response.content)
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("record_created", sobject=sobject, id=result['id'])
+        return result['id']
+
     def get(self, sobject: str, record_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get a record by ID.
@@ -91,19 +246,18 @@ class SalesforceClient:
         Returns:
             Record data
         """
-        url = f"{self.base_url}/sobjects/{sobject}/{record_id}"
+        url = self._sobject_url(sobject) + "/" + record_id
 
         if fields:
             url += f"?fields={','.join(fields)}"
 
-        response = self._session.get(url, headers=self.headers)
+        response = self._send("GET", url)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
+        if response.status_code not in OK:
             self._handle_error(response, "get", sobject, record_id)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+        return orjson.loads(response.content)
+
     def update(self, sobject: str, record_id: str, data: Dict[str, Any]) -> bool:
         """
         Update an existing record.
@@ -116,17 +270,17 @@ class SalesforceClient:
         Returns:
             True if successful
         """
-        url = f"{self.base_url}/sobjects/{sobject}/{record_id}"
+        url = self._sobject_url(sobject) + "/" + record_id
 
-        response = self._session.patch(url, headers=self.headers, json=data)
+        response = self._send("PATCH", url, data=orjson.dumps(data))
 
-        if response.status_code == 204:
-            logger.info("record_updated", sobject=sobject, id=record_id)
-            return True
-        else:
+        if response.status_code not in OK_NO_CONTENT:
             self._handle_error(response, "update", sobject, record_id)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("record_updated", sobject=sobject, id=record_id)
+        return True
+
     def delete(self, sobject: str, record_id: str) -> bool:
         """
         Delete a record.
@@ -138,17 +292,17 @@ class SalesforceClient:
         Returns:
             True if successful
         """
-        url = f"{self.base_url}/sobjects/{sobject}/{record_id}"
+        url = self._sobject_url(sobject) + "/" + record_id
 
-        response = self._session.delete(url, headers=self.headers)
+        response = self._send("DELETE", url)
 
-        if response.status_code == 204:
-            logger.info("record_deleted", sobject=sobject, id=record_id)
-            return True
-        else:
+        if response.status_code not in OK_NO_CONTENT:
             self._handle_error(response, "delete", sobject, record_id)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("record_deleted", sobject=sobject, id=record_id)
+        return True
+
     def upsert(self, sobject: str, external_id_field: str, external_id: str, data: Dict[str, Any]) -> str:
         """
         Upsert a record using an external ID.
@@ -162,22 +316,20 @@ class SalesforceClient:
         Returns:
             Record ID
         """
-        url = f"{self.base_url}/sobjects/{sobject}/{external_id_field}/{external_id}"
+        url = f"{self._sobject_url(sobject)}/{external_id_field}/{external_id}"
 
-        response = self._session.patch(url, headers=self.headers, json=data)
+        response = self._send("PATCH", url, data=orjson.dumps(data))
 
-        if response.status_code in (200, 201, 204):
-            if response.status_code == 204:
-                # Update - no body returned
-                return external_id
-            result = response.json()
-            return result.get('id', external_id)
-        else:
+        if response.status_code not in OK_UPSERT:
             self._handle_error(response, "upsert", sobject, external_id)
 
+        if response.status_code == 204:
+            # Update - no body returned
+            return external_id
+        return orjson.loads(response.content).get('id', external_id)
+
     # ==================== Query Operations ====================
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     def query(self, soql: str) -> QueryResult:
         """
         Execute a SOQL query.
@@ -188,59 +340,122 @@ class SalesforceClient:
         Returns:
             QueryResult with records
         """
-        url = f"{self.base_url}/query"
+        return QueryResult.from_json(self._query_page(soql))
 
-        response = self._session.get(url, headers=self.headers, params={'q': soql})
-
-        if response.status_code == 200:
-            data = response.json()
-            return QueryResult(
-                total_size=data['totalSize'],
-                done=data['done'],
-                records=data['records'],
-                next_records_url=data.get('nextRecordsUrl')
-            )
-        else:
-            self._handle_error(response, "query", soql=soql)
-
-    def query_all(self, soql: str) -> List[Dict[str, Any]]:
+    def query_all(self, soql: str, bulk_threshold: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Execute a SOQL query and return all records (handles pagination).
 
         Args:
             soql: SOQL query string
+            bulk_threshold: If set, queries without a LIMIT matching more rows
+                than this are re-run as a Bulk API query job (see query_bulk)
 
         Returns:
             List of all matching records
         """
-        all_records = []
-        result = self.query(soql)
-        all_records.extend(result.records)
+        pages = self._iter_query_pages(soql)
+        first = next(pages)
+
+        if bulk_threshold is not None and first.total_size > bulk_threshold and not SOQL_LIMIT.search(soql):
+            pages.close()
+            logger.info("query_routed_to_bulk", total_size=first.total_size)
+            return self.query_bulk(soql)
 
-        while not result.done and result.next_records_url:
-            result = self._query_more(result.next_records_url)
-            all_records.extend(result.records)
+        all_records = list(first.records)
+
+        for page in pages:
+            all_records.extend(page.records)
 
         logger.info("query_completed", total_records=len(all_records))
         return all_records
 
+    def iter_query(self, soql: str) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SOQL query and yield records as each page arrives.
+
+        Only the current page is held in memory, so callers can process
+        and discard records from very large result sets.
+
+        Args:
+            soql: SOQL query string
+
+        Yields:
+            Matching records, in query order
+        """
+        for page in self._iter_query_pages(soql):
+            yield from page.records
+
+    def query_bulk(self, soql: str) -> List[Dict[str, Any]]:
+        """
+        Execute a SOQL query as a Bulk API 2.0 query job.
+
+        Suited to extracts of millions of rows: Salesforce chunks the scan
+        server-side instead of serving one queryMore cursor. Values are
+        returned as strings and relationship fields are flattened
+        (e.g. "Account.Name"), unlike query_all.
+
+        Args:
+            soql: SOQL query string
+
+        Returns:
+            List of all matching records
+        """
+        if self._bulk is None:
+            self._bulk = BulkClient(self.auth)
+        return self._bulk.query(soql)
+
+    def _iter_query_pages(self, soql: str) -> Iterator[QueryResult]:
+        """
+        Yield every page of a query, prefetching the next page in the background.
+
+        Salesforce writes nextRecordsUrl ahead of the records array, so the
+        request for page k+1 is in flight while page k is decoded and consumed.
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            content = self._query_page(soql)
+
+            while True:
+                next_url = _peek_next_records_url(content)
+                pending = prefetcher.submit(self._query_more_page, next_url) if next_url else None
+
+                page = QueryResult.from_json(content)
+                yield page
+
+                if pending is not None:
+                    content = pending.result()
+                elif not page.done and page.next_records_url:
+                    content = self._query_more_page(page.next_records_url)
+                else:
+                    return
+
     def _query_more(self, next_url: str) -> QueryResult:
         """Get next page of query results"""
-        url = f"{self.auth.token.instance_url}{next_url}"
-
-        response = self._session.get(url, headers=self.headers)
-
-        if response.status_code == 200:
-            data = response.json()
-            return QueryResult(
-                total_size=data['totalSize'],
-                done=data['done'],
-                records=data['records'],
-                next_records_url=data.get('nextRecordsUrl')
-            )
-        else:
+        return QueryResult.from_json(self._query_more_page(next_url))
+
+    def _query_page(self, soql: str) -> bytes:
+        """Fetch the raw first page of a query"""
+        url = f"{self.base_url}/query"
+
+        response = self._send("GET", url, params={'q': soql})
+
+        if response.status_code not in OK:
+            self._handle_error(response, "query", soql=soql)
+
+        return response.content
+
+    def _query_more_page(self, next_url: str) -> bytes:
+        """Fetch a raw follow-up page of query results"""
+        # next_url comes from a page fetched through base_url, so the instance is cached
+        url = f"{self._instance_url}{next_url}"
+
+        response = self._send("GET", url)
+
+        if response.status_code not in OK:
             self._handle_error(response, "query_more")
 
+        return response.content
+
     def search(self, sosl: str) -> List[Dict[str, Any]]:
         """
         Execute a SOSL search.
@@ -253,13 +468,13 @@ class SalesforceClient:
         """
         url = f"{self.base_url}/search"
 
-        response = self._session.get(url, headers=self.headers, params={'q': sosl})
+        response = self._send("GET", url, params={'q': sosl})
 
-        if response.status_code == 200:
-            return response.json().get('searchRecords', [])
-        else:
+        if response.status_code not in OK:
             self._handle_error(response, "search", sosl=sosl)
 
+        return orjson.loads(response.content).get('searchRecords', [])
+
     # ==================== Composite Operations ====================
 
     def composite(self, requests: List[Dict[str, Any]], all_or_none: bool = False) -> List[Dict[str, Any]]:
@@ -280,13 +495,87 @@ class SalesforceClient:
             'compositeRequest': requests
         }
 
-        response = self._session.post(url, headers=self.headers, json=payload)
+        body, headers = self._encode_body(payload)
+        response = self._session.post(url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
 
-        if response.status_code == 200:
-            return response.json().get('compositeResponse', [])
-        else:
+        if response.status_code not in OK:
             self._handle_error(response, "composite")
 
+        return orjson.loads(response.content).get('compositeResponse', [])
+
+    def create_many(self, sobject: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create records through sObject Collections (200 per request).
+
+        Args:
+            sobject: Salesforce object name
+            records: Field values for each new record
+
+        Returns:
+            Per-record results ({'id', 'success', 'errors'}) in input order
+        """
+        records = [{'attributes': {'type': sobject}, **record} for record in records]
+        return self._collection_request("post", sobject, records)
+
+    def update_many(self, sobject: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update records through sObject Collections (200 per request).
+
+        Args:
+            sobject: Salesforce object name
+            records: Field values to update, each including 'Id'
+
+        Returns:
+            Per-record results ({'id', 'success', 'errors'}) in input order
+        """
+        records = [{'attributes': {'type': sobject}, **record} for record in records]
+        return self._collection_request("patch", sobject, records)
+
+    def delete_many(self, sobject: str, record_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Delete records through sObject Collections (200 per request).
+
+        Args:
+            sobject: Salesforce object name
+            record_ids: Record IDs
+
+        Returns:
+            Per-record results ({'id', 'success', 'errors'}) in input order
+        """
+        return self._collection_request("delete", sobject, record_ids)
+
+    def _collection_request(self, method: str, sobject: str, items: List[Any]) -> List[Dict[str, Any]]:
+        """Send records or IDs to /composite/sobjects in chunks, without allOrNone"""
+        url = f"{self.base_url}/composite/sobjects"
+        results = []
+
+        for start in range(0, len(items), COLLECTION_MAX):
+            chunk = items[start:start + COLLECTION_MAX]
+
+            if method == "delete":
+                params = {'ids': ','.join(chunk), 'allOrNone': 'false'}
+                response = self._send("DELETE", url, params=params)
+            else:
+                payload = {'allOrNone': False, 'records': chunk}
+                body, headers = self._encode_body(payload)
+                response = self._session.request(method, url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
+
+            if response.status_code not in OK:
+                self._handle_error(response, f"{method}_many", sobject)
+
+            results.extend(orjson.loads(response.content))
+
+        logger.info("collection_processed", operation=method, sobject=sobject, records=len(items))
+        return results
+
+    def batch(self) -> 'CompositeBatcher':
+        """
+        Start packing independent subrequests into /composite/batch calls.
+
+        Use as a context manager; pending subrequests are sent on exit.
+        """
+        return CompositeBatcher(self)
+
     def composite_tree(self, sobject: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Create multiple related records in a single call.
@@ -302,45 +591,95 @@ class SalesforceClient:
 
         payload = {'records': records}
 
-        response = self._session.post(url, headers=self.headers, json=payload)
+        body, headers = self._encode_body(payload)
+        response = self._session.post(url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
 
-        if response.status_code == 201:
-            return response.json()
-        else:
+        if response.status_code not in OK_CREATE:
             self._handle_error(response, "composite_tree", sobject)
 
+        return orjson.loads(response.content)
+
     # ==================== Metadata Operations ====================
 
     def describe(self, sobject: str) -> Dict[str, Any]:
-        """Get object metadata"""
-        url = f"{self.base_url}/sobjects/{sobject}/describe"
-
-        response = self._session.get(url, headers=self.headers)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
+        """Get object metadata (cached for DESCRIBE_CACHE_TTL per instance and API version)"""
+        key = (self.base_url, sobject)
+        now = time.time()
+
+        cached = self._describes.get(key)
+        if cached is not None and now - cached[0] < DESCRIBE_CACHE_TTL:
+            return cached[1]
+
+        cache_path = self._describe_cache_path(sobject)
+        if cache_path is not None:
+            try:
+                fetched_at = cache_path.stat().st_mtime
+                if now - fetched_at < DESCRIBE_CACHE_TTL:
+                    result = orjson.loads(cache_path.read_bytes())
+                    self._describes[key] = (fetched_at, result)
+                    return result
+            except (OSError, orjson.JSONDecodeError):
+                pass
+
+        url = self._sobject_url(sobject) + "/describe"
+
+        response = self._send("GET", url)
+
+        if response.status_code not in OK:
             self._handle_error(response, "describe", sobject)
 
+        result = orjson.loads(response.content)
+        self._describes[key] = (now, result)
+
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_bytes(response.content)
+                os.chmod(cache_path, 0o600)
+            except OSError as e:
+                logger.warning("describe_cache_failed", sobject=sobject, error=str(e))
+
+        return result
+
+    def clear_describe_cache(self):
+        """Drop cached describe() results, in memory and on disk"""
+        self._describes.clear()
+        if self._describe_cache_dir is not None:
+            for cache_file in self._describe_cache_dir.glob("*/*/*.json"):
+                cache_file.unlink(missing_ok=True)
+
+    def _describe_cache_path(self, sobject: str) -> Optional[Path]:
+        """Get the on-disk describe cache file for this instance and API version"""
+        if self._describe_cache_dir is None:
+            return None
+        host = urlsplit(self.base_url).netloc
+        return self._describe_cache_dir / host / self.API_VERSION / f"{sobject}.json"
+
     def get_limits(self) -> Dict[str, Any]:
         """Get org limits"""
         url = f"{self.base_url}/limits"
 
-        response = self._session.get(url, headers=self.headers)
+        response = self._send("GET", url)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
+        if response.status_code not in OK:
             self._handle_error(response, "limits")
 
+        return orjson.loads(response.content)
+
     # ==================== Error Handling ====================
 
     def _handle_error(self, response: requests.Response, operation: str, sobject: str = None, record_id: str = None, **kwargs):
         """Handle API errors"""
-        try:
-            error_data = response.json()
-        except:
-            error_data = {'message': response.text}
+        body = response.content
+
+        # Only JSON bodies are decoded; empty and HTML/text error pages skip the parse attempt
+        if body and 'json' in response.headers.get('Content-Type', ''):
+            try:
+                error_data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                error_data = {'message': body.decode('utf-8', 'replace')}
+        else:
+            error_data = {'message': body.decode('utf-8', 'replace') if body else response.reason}
 
         logger.error(
             "salesforce_api_error",
@@ -359,6 +698,95 @@ class SalesforceClient:
         )
 
 
+class CompositeBatcher:
+    """
+    Packs independent REST subrequests into /composite/batch calls.
+
+    Subrequests are sent 25 at a time, in enqueue order, whenever the batch
+    fills or flush() is called. Each enqueue() returns a Future resolving
+    to that subrequest's response body, or failing with SalesforceAPIError.
+    """
+
+    def __init__(self, client: SalesforceClient):
+        self._client = client
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+
+    def __enter__(self) -> 'CompositeBatcher':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def enqueue(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Queue a subrequest.
+
+        Args:
+            method: HTTP method
+            url: Path relative to the API version (e.g. 'sobjects/Account')
+            body: Optional request body
+
+        Returns:
+            Future for the subrequest's result
+        """
+        subrequest = {'method': method, 'url': f"{self._client.API_VERSION}/{url}"}
+        if body is not None:
+            subrequest['richInput'] = body
+
+        future = Future()
+        self._pending.append((subrequest, future))
+
+        if len(self._pending) >= COMPOSITE_BATCH_MAX:
+            self.flush()
+
+        return future
+
+    def flush(self):
+        """Send all pending subrequests"""
+        while self._pending:
+            chunk = self._pending[:COMPOSITE_BATCH_MAX]
+            self._pending = self._pending[COMPOSITE_BATCH_MAX:]
+
+            try:
+                results = self._send([subrequest for subrequest, _ in chunk])
+            except Exception as e:
+                for _, future in chunk:
+                    future.set_exception(e)
+                continue
+
+            # A short results list would otherwise leave the trailing futures unresolved forever
+            for _, future in chunk[len(results):]:
+                future.set_exception(SalesforceAPIError(
+                    f"Composite batch returned {len(results)} results for {len(chunk)} subrequests"
+                ))
+
+            for (_, future), result in zip(chunk, results):
+                status_code = result.get('statusCode', 500)
+                if status_code < 300:
+                    future.set_result(result.get('result'))
+                else:
+                    future.set_exception(SalesforceAPIError(
+                        f"API Error ({status_code}): {result.get('result')}",
+                        status_code=status_code,
+                        error_data=result.get('result')
+                    ))
+
+    def _send(self, subrequests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """POST one /composite/batch request"""
+        client = self._client
+        url = f"{client.base_url}/composite/batch"
+
+        payload = {'haltOnError': False, 'batchRequests': subrequests}
+
+        body, headers = client._encode_body(payload)
+        response = client._session.post(url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code not in OK:
+            client._handle_error(response, "composite_batch")
+
+        return orjson.loads(response.content).get('results', [])
+
+
 class SalesforceAPIError(Exception):
     """Salesforce API error"""
     def __init__(self, message: str, status_code: int = None, error_data: dict = None):
@@ -6,15 +6,22 @@ Handles token acquisition, refresh, and secure storage.
 
 import os
 import time
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import structlog
 
 logger = structlog.get_logger()
 
+# (connect, read) timeout for token endpoint calls
+TOKEN_REQUEST_TIMEOUT = (3.05, 30)
+
+# Parsed token cache files, keyed by path and validated against st_mtime_ns
+_TOKEN_FILE_CACHE: Dict[Path, Tuple[int, 'TokenInfo']] = {}
+
 
 @dataclass
 class AuthConfig:
@@ -106,6 +113,12 @@ class SalesforceAuth:
 
         self.token_cache_path = Path(token_cache_path or "~/.blackroad/sf_token.json").expanduser()
         self._token: Optional[TokenInfo] = None
+        self._headers: Optional[dict] = None
+        self._token_listeners: List[Callable[[TokenInfo], None]] = []
+
+        # Keep-alive session for the token endpoints, so refreshes skip the TLS handshake
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=2))
 
         # Try to load cached token
         self._load_cached_token()
@@ -131,11 +144,31 @@ class SalesforceAuth:
 
     @property
     def headers(self) -> dict:
-        """Get authorization headers for API requests"""
-        return {
-            'Authorization': f'Bearer {self.access_token}',
+        """Get authorization headers for API requests (shared; do not mutate)"""
+        if self._token is None or self._token.is_expired:
+            self.authenticate()
+        return self._headers
+
+    def add_token_listener(self, callback: Callable[[TokenInfo], None]):
+        """
+        Register a callback invoked whenever a new token is set.
+
+        Lets clients keep cached auth headers in sync across refreshes.
+        Called immediately if a token is already available.
+        """
+        self._token_listeners.append(callback)
+        if self._token is not None:
+            callback(self._token)
+
+    def _set_token(self, token: TokenInfo):
+        """Store a new token and notify listeners"""
+        self._token = token
+        self._headers = {
+            'Authorization': f'Bearer {token.access_token}',
             'Content-Type': 'application/json'
         }
+        for callback in self._token_listeners:
+            callback(token)
 
     def authenticate(self) -> TokenInfo:
         """
@@ -165,22 +198,22 @@ class SalesforceAuth:
             'password': f"{self.password}{self.security_token}"
         }
 
-        response = requests.post(token_url, data=payload)
+        response = self._http.post(token_url, data=payload, timeout=TOKEN_REQUEST_TIMEOUT)
 
         if response.status_code != 200:
-            error = response.json()
+            error = orjson.loads(response.content)
             logger.error("authentication_failed", error=error)
             raise AuthenticationError(f"Authentication failed: {error.get('error_description', error)}")
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
-        self._token = TokenInfo(
+        self._set_token(TokenInfo(
             access_token=data['access_token'],
             refresh_token=data.get('refresh_token'),
             instance_url=data['instance_url'],
             token_type=data['token_type'],
             issued_at=float(data['issued_at']) / 1000  # Convert ms to seconds
-        )
+        ))
 
         self._cache_token()
 
@@ -201,20 +234,20 @@ class SalesforceAuth:
             'refresh_token': self._token.refresh_token
         }
 
-        response = requests.post(token_url, data=payload)
+        response = self._http.post(token_url, data=payload, timeout=TOKEN_REQUEST_TIMEOUT)
 
         if response.status_code != 200:
             raise AuthenticationError("Token refresh failed")
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
-        self._token = TokenInfo(
+        self._set_token(TokenInfo(
             access_token=data['access_token'],
             refresh_token=self._token.refresh_token,  # Keep existing refresh token
             instance_url=data['instance_url'],
             token_type=data['token_type'],
             issued_at=time.time()
-        )
+        ))
 
         self._cache_token()
 
@@ -225,21 +258,32 @@ class SalesforceAuth:
         """Cache token to disk"""
         try:
             self.token_cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.token_cache_path, 'w') as f:
-                json.dump(self._token.to_dict(), f)
+            self.token_cache_path.write_bytes(orjson.dumps(self._token.to_dict()))
             # Secure the file
             os.chmod(self.token_cache_path, 0o600)
+            _TOKEN_FILE_CACHE[self.token_cache_path] = (self.token_cache_path.stat().st_mtime_ns, self._token)
         except Exception as e:
             logger.warning("token_cache_failed", error=str(e))
 
     def _load_cached_token(self):
         """Load cached token from disk"""
         try:
-            if self.token_cache_path.exists():
-                with open(self.token_cache_path, 'r') as f:
-                    data = json.load(f)
-                self._token = TokenInfo.from_dict(data)
-                logger.info("loaded_cached_token")
+            mtime_ns = self.token_cache_path.stat().st_mtime_ns
+        except OSError:
+            # Missing or unreadable cache: authenticate as if there were no token
+            return
+
+        try:
+            # Reuse the parsed token if the file hasn't changed since it was last read
+            cached = _TOKEN_FILE_CACHE.get(self.token_cache_path)
+            if cached is not None and cached[0] == mtime_ns:
+                self._set_token(cached[1])
+                return
+
+            token = TokenInfo.from_dict(orjson.loads(self.token_cache_path.read_bytes()))
+            _TOKEN_FILE_CACHE[self.token_cache_path] = (mtime_ns, token)
+            self._set_token(token)
+            logger.info("loaded_cached_token")
         except Exception as e:
             logger.warning("load_cached_token_failed", error=str(e))
 
@@ -249,14 +293,19 @@ class SalesforceAuth:
             return
 
         revoke_url = f"{self._token.instance_url}/services/oauth2/revoke"
-        requests.post(revoke_url, data={'token': self._token.access_token})
+        self._http.post(revoke_url, data={'token': self._token.access_token}, timeout=TOKEN_REQUEST_TIMEOUT)
 
         self._token = None
+        _TOKEN_FILE_CACHE.pop(self.token_cache_path, None)
         if self.token_cache_path.exists():
             self.token_cache_path.unlink()
 
         logger.info("token_revoked")
 
+    def close(self):
+        """Close the token endpoint session"""
+        self._http.close()
+
     @classmethod
     def from_sfdx(cls, username: str = None, sfdx_dir: str = "~/.sfdx") -> 'SalesforceAuth':
         """
@@ -288,8 +337,7 @@ class SalesforceAuth:
         if not auth_file.exists():
             raise AuthenticationError(f"Auth file not found: {auth_file}")
 
-        with open(auth_file) as f:
-            data = json.load(f)
+        data = orjson.loads(auth_file.read_bytes())
 
         # Create instance
         instance = cls(
@@ -300,14 +348,14 @@ class SalesforceAuth:
         )
 
         # Set token directly
-        instance._token = TokenInfo(
+        instance._set_token(TokenInfo(
             access_token=data["accessToken"],
             refresh_token=data.get("refreshToken"),
             instance_url=data["instanceUrl"],
             token_type="Bearer",
             issued_at=time.time(),
             expires_in=7200
-        )
+        ))
 
         logger.info("loaded_sfdx_auth", username=data["username"], instance=data["instanceUrl"])
         return instance
@@ -12,19 +12,26 @@ Usage:
 
 import sys
 import time
+import logging
 import signal
 import argparse
+import threading
 from datetime import datetime
+from pathlib import Path
+from concurrent.futures import Future
+from typing import List, Tuple
+import orjson
 import structlog
 
 from .auth.oauth import SalesforceAuth
-from .api.client import SalesforceClient
-from .api.bulk import BulkClient
+from .api.client import SalesforceClient, CompositeBatcher, COLLECTION_MAX
+from .api.bulk import BulkClient, BulkJobSubmittedError, BulkOperation, JobState
 from .queue.task_queue import TaskQueue, Task, TaskStatus, TaskPriority
 
 # Configure logging for daemon
 structlog.configure(
     processors=[
+        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.JSONRenderer()
@@ -32,10 +39,23 @@ structlog.configure(
     wrapper_class=structlog.stdlib.BoundLogger,
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
+    cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
+# Stdlib logger behind structlog's LoggerFactory; per-task events are skipped when INFO is filtered
+_stdlib_logger = logging.getLogger(__name__)
+
+# Streamed query results are written here as JSON Lines, one file per task
+RESULTS_DIR = Path("~/.blackroad/results").expanduser()
+
+# bulk_insert tasks with at least this many records are submitted without waiting
+BULK_ASYNC_THRESHOLD = 2000
+
+# Single-record operations that can be coalesced into one sObject Collections call
+COLLECTION_OPERATIONS = ("create", "update", "delete")
+
 
 class SalesforceDaemon:
     """Daemon that processes Salesforce tasks from queue"""
@@ -56,6 +76,10 @@ class SalesforceDaemon:
         self.tasks_failed = 0
         self.start_time = None
 
+        # Bulk jobs submitted but not yet reaped; _reap_bulk_job notifies when it finishes
+        self._bulk_jobs = 0
+        self._bulk_jobs_changed = threading.Condition()
+
     def start(self):
         """Start the daemon"""
         logger.info("daemon_starting", username=self.username)
@@ -93,32 +117,31 @@ class SalesforceDaemon:
 
     def _run_loop(self):
         """Main processing loop"""
-        idle_count = 0
-        last_status = time.time()
+        last_status = time.monotonic()
 
         while self.running:
             try:
-                # Check for tasks
-                task = self.queue.get_next(f"daemon-{self.username}")
+                # Wait for tasks instead of sleeping between empty polls
+                tasks = self.queue.get_batch_blocking(f"daemon-{self.username}", COLLECTION_MAX, timeout=30.0)
 
-                if task:
-                    idle_count = 0
-                    self._process_task(task)
-                else:
-                    idle_count += 1
-                    # Adaptive sleep: 1s, 2s, 4s, max 30s
-                    sleep_time = min(30, 2 ** min(idle_count // 10, 5))
-                    time.sleep(sleep_time)
+                if tasks:
+                    self._process_tasks(tasks)
 
                 # Periodic status log (every 5 minutes)
-                if time.time() - last_status > 300:
+                if time.monotonic() - last_status > 300:
                     self._log_status()
-                    last_status = time.time()
+                    last_status = time.monotonic()
 
             except Exception as e:
                 logger.error("loop_error", error=str(e))
                 time.sleep(5)
 
+        # Let submitted bulk jobs be reaped so their tasks aren't left processing
+        self._wait_for_bulk_jobs()
+
+        self.queue.close()
+        self.auth.close()
+
         logger.info("daemon_stopped",
                    tasks_processed=self.tasks_processed,
                    tasks_failed=self.tasks_failed,
@@ -126,10 +149,12 @@ class SalesforceDaemon:
 
     def _process_task(self, task: Task):
         """Process a single task"""
-        logger.info("task_processing",
-                   task_id=task.id,
-                   operation=task.operation,
-                   sobject=task.sobject)
+        log_info = _stdlib_logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("task_processing",
+                       task_id=task.id,
+                       operation=task.operation,
+                       sobject=task.sobject)
 
         try:
             result = None
@@ -139,8 +164,9 @@ class SalesforceDaemon:
                 result = {"id": record_id, "success": True}
 
             elif task.operation == "update":
-                record_id = task.data.pop("id")
-                self.client.update(task.sobject, record_id, task.data)
+                record_id = task.data["id"]
+                fields = {key: value for key, value in task.data.items() if key != "id"}
+                self.client.update(task.sobject, record_id, fields)
                 result = {"id": record_id, "success": True}
 
             elif task.operation == "delete":
@@ -150,11 +176,18 @@ class SalesforceDaemon:
 
             elif task.operation == "query":
                 soql = task.data.get("soql")
-                query_result = self.client.query(soql)
-                result = {"records": query_result.records, "total": query_result.total_size}
+                if task.data.get("streaming"):
+                    result = self._stream_query(task, soql)
+                else:
+                    query_result = self.client.query(soql)
+                    result = {"records": query_result.records, "total": query_result.total_size}
 
             elif task.operation == "bulk_insert":
                 records = task.data.get("records", [])
+                if len(records) >= BULK_ASYNC_THRESHOLD:
+                    self._submit_bulk_job(task, records)
+                    return
+
                 bulk_result = self.bulk.insert(task.sobject, records)
                 result = {
                     "job_id": bulk_result.job_id,
@@ -167,13 +200,214 @@ class SalesforceDaemon:
 
             self.queue.complete(task.id, result)
             self.tasks_processed += 1
-            logger.info("task_completed", task_id=task.id, operation=task.operation)
+            if log_info:
+                logger.info("task_completed", task_id=task.id, operation=task.operation)
 
         except Exception as e:
-            self.queue.fail(task.id, str(e))
+            # Once a bulk job's data is submitted, records may exist; retrying would duplicate them
+            self.queue.fail(task.id, str(e), retry=not isinstance(e, BulkJobSubmittedError))
             self.tasks_failed += 1
             logger.error("task_failed", task_id=task.id, error=str(e))
 
+    def _process_tasks(self, tasks: List[Task]):
+        """Process a claimed burst of tasks, packing lone CRUD tasks into composite batches"""
+        batched: List[Tuple[Task, Future]] = []
+
+        with self.client.batch() as batcher:
+            for group in self._group_tasks(tasks):
+                if len(group) == 1 and group[0].operation in COLLECTION_OPERATIONS:
+                    batched.append((group[0], self._enqueue_task(batcher, group[0])))
+                    continue
+
+                # Send batched tasks first so records change in queue order
+                batcher.flush()
+                self._resolve_batched(batched)
+                batched = []
+
+                if len(group) > 1:
+                    self._process_collection(group)
+                else:
+                    self._process_task(group[0])
+
+        self._resolve_batched(batched)
+
+    def _enqueue_task(self, batcher: CompositeBatcher, task: Task) -> Future:
+        """Queue a single-record CRUD task as a composite batch subrequest"""
+        if task.operation == "create":
+            return batcher.enqueue("POST", f"sobjects/{task.sobject}", task.data)
+
+        record_id = task.data.get("id")
+        if task.operation == "update":
+            fields = {key: value for key, value in task.data.items() if key != "id"}
+            return batcher.enqueue("PATCH", f"sobjects/{task.sobject}/{record_id}", fields)
+
+        return batcher.enqueue("DELETE", f"sobjects/{task.sobject}/{record_id}")
+
+    def _resolve_batched(self, batched: List[Tuple[Task, Future]]):
+        """Complete or fail tasks whose composite batch subrequests have been sent"""
+        failures: List[Tuple[str, str]] = []
+        # The batch may have reached Salesforce before failing, so creates aren't resent
+        create_failures: List[Tuple[str, str]] = []
+
+        for task, future in batched:
+            try:
+                result = future.result()
+            except Exception as e:
+                (create_failures if task.operation == "create" else failures).append((task.id, str(e)))
+                logger.error("task_failed", task_id=task.id, error=str(e))
+                continue
+
+            record_id = result["id"] if task.operation == "create" else task.data.get("id")
+            self.queue.complete(task.id, {"id": record_id, "success": True})
+            self.tasks_processed += 1
+            if _stdlib_logger.isEnabledFor(logging.INFO):
+                logger.info("task_completed", task_id=task.id, operation=task.operation)
+
+        self.queue.fail_many(failures)
+        self.queue.fail_many(create_failures, retry=False)
+        self.tasks_failed += len(failures) + len(create_failures)
+
+    def _submit_bulk_job(self, task: Task, records: list):
+        """Upload a large bulk insert and leave the task processing until the job finishes"""
+        job_id = self.bulk.submit(task.sobject, BulkOperation.INSERT, records)
+
+        future = self.bulk.watch(job_id)
+        with self._bulk_jobs_changed:
+            self._bulk_jobs += 1
+        future.add_done_callback(lambda f: self._reap_bulk_job(task, job_id, f))
+
+        logger.info("bulk_job_submitted", task_id=task.id, job_id=job_id, records=len(records))
+
+    def _reap_bulk_job(self, task: Task, job_id: str, future: Future):
+        """Complete or fail a task once its bulk job reaches a terminal state (poller thread)"""
+        try:
+            try:
+                state = future.result()
+            except Exception:
+                # Polling gave up (e.g. timed out) but the job may still be running and commit records
+                self._abort_bulk_job(job_id)
+                raise
+            if state != JobState.JOB_COMPLETE:
+                raise RuntimeError(f"Job ended in state {state.value}")
+
+            info = self.bulk.get_job_info(job_id)
+            self.queue.complete(task.id, {
+                "job_id": job_id,
+                "processed": info.get("numberRecordsProcessed", 0),
+                "failed": info.get("numberRecordsFailed", 0)
+            })
+            self.tasks_processed += 1
+            logger.info("task_completed", task_id=task.id, operation=task.operation)
+
+        except Exception as e:
+            # The job's data was already submitted, so a retry could duplicate records;
+            # the job id stays in the error so its records can be reconciled
+            self.queue.fail(task.id, f"Bulk job {job_id}: {e}", retry=False)
+            self.tasks_failed += 1
+            logger.error("task_failed", task_id=task.id, job_id=job_id, error=str(e))
+
+        finally:
+            with self._bulk_jobs_changed:
+                self._bulk_jobs -= 1
+                self._bulk_jobs_changed.notify_all()
+
+    def _abort_bulk_job(self, job_id: str):
+        """Abort a bulk job whose outcome is unknown (best effort)"""
+        try:
+            self.bulk.abort_job(job_id)
+            logger.warning("bulk_job_aborted", job_id=job_id)
+        except Exception as e:
+            logger.error("bulk_job_abort_failed", job_id=job_id, error=str(e))
+
+    def _wait_for_bulk_jobs(self):
+        """Block until every submitted bulk job has been reaped"""
+        with self._bulk_jobs_changed:
+            if self._bulk_jobs:
+                logger.info("waiting_for_bulk_jobs", jobs=self._bulk_jobs)
+            self._bulk_jobs_changed.wait_for(lambda: self._bulk_jobs == 0)
+
+    def _stream_query(self, task: Task, soql: str) -> dict:
+        """Write every page of a query to a JSON Lines file as it arrives"""
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{task.id}.jsonl"
+        total = 0
+
+        with open(path, "wb") as f:
+            for record in self.client.iter_query(soql):
+                f.write(orjson.dumps(record))
+                f.write(b"\n")
+                total += 1
+
+        return {"path": str(path), "total": total}
+
+    def _group_tasks(self, tasks: List[Task]) -> List[List[Task]]:
+        """Split tasks into runs of adjacent same-operation, same-sobject CRUD tasks"""
+        groups: List[List[Task]] = []
+
+        for task in tasks:
+            if (
+                groups
+                and task.operation in COLLECTION_OPERATIONS
+                and groups[-1][0].operation == task.operation
+                and groups[-1][0].sobject == task.sobject
+            ):
+                groups[-1].append(task)
+            else:
+                groups.append([task])
+
+        return groups
+
+    def _process_collection(self, tasks: List[Task]):
+        """Process a run of same-operation CRUD tasks in one sObject Collections call"""
+        operation, sobject = tasks[0].operation, tasks[0].sobject
+        logger.info("collection_processing", operation=operation, sobject=sobject, tasks=len(tasks))
+
+        try:
+            if operation == "create":
+                results = self.client.create_many(sobject, [task.data for task in tasks])
+
+            elif operation == "update":
+                records = [
+                    {"Id": task.data["id"], **{key: value for key, value in task.data.items() if key != "id"}}
+                    for task in tasks
+                ]
+                results = self.client.update_many(sobject, records)
+
+            else:
+                results = self.client.delete_many(sobject, [task.data.get("id") for task in tasks])
+
+        except Exception as e:
+            # The request may have reached Salesforce before failing, so creates aren't resent
+            self.queue.fail_many([(task.id, str(e)) for task in tasks], retry=operation != "create")
+            self.tasks_failed += len(tasks)
+            logger.error("collection_failed", operation=operation, sobject=sobject, error=str(e))
+            return
+
+        # Results come back in request order, one per record
+        failures: List[Tuple[str, str]] = []
+        for task, row in zip(tasks, results):
+            if row.get("success"):
+                record_id = row.get("id") or task.data.get("id")
+                self.queue.complete(task.id, {"id": record_id, "success": True})
+                self.tasks_processed += 1
+            else:
+                error = "; ".join(err.get("message", "") for err in row.get("errors", []))
+                failures.append((task.id, error or "Record operation failed"))
+
+        self.queue.fail_many(failures)
+        self.tasks_failed += len(failures)
+
+        # zip stops at the shorter list; tasks without a result row must not stay processing
+        missing = tasks[len(results):]
+        if missing:
+            error = f"No result for record ({len(results)} results for {len(tasks)} records)"
+            # A create without a result may still have happened, so only updates and deletes retry
+            self.queue.fail_many([(task.id, error) for task in missing], retry=operation != "create")
+            self.tasks_failed += len(missing)
+            logger.error("collection_results_missing", operation=operation, sobject=sobject, missing=len(missing))
+
+        logger.info("collection_completed", operation=operation, sobject=sobject, tasks=len(tasks))
+
     def _log_status(self):
         """Log daemon status"""
         stats = self.queue.stats()
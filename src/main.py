@@ -12,7 +12,10 @@ Usage:
 
 import os
 import sys
+import copy
+import functools
 import argparse
+import orjson
 import yaml
 from pathlib import Path
 import structlog
@@ -42,15 +45,66 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+# LibYAML's C loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Config paths already warned about not being JSON, so each is reported once per process
+_YAML_CONFIG_WARNED = set()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file once per (path, mtime, size), reusing a JSON sidecar across processes for YAML"""
+    with open(path, "rb") as f:
+        text = f.read()
+
+    # JSON configs (a JSON object is also valid YAML) skip the YAML parser and the sidecar;
+    # YAML flow collections like {a: 1} start the same way, so they fall through on a parse error
+    if text.lstrip()[:1] in (b"{", b"["):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    if path not in _YAML_CONFIG_WARNED:
+        _YAML_CONFIG_WARNED.add(path)
+        logger.warning("config_not_json", path=path, hint="convert the config to JSON for faster loading across the fleet")
+
+    sidecar = Path(path + ".cache.json")
+    stamp = [mtime_ns, size]
+
+    try:
+        cached = orjson.loads(sidecar.read_bytes())
+        if cached.get("source") == stamp:
+            return cached["config"]
+    except (OSError, orjson.JSONDecodeError, AttributeError):
+        pass
+
+    config = yaml.load(text, Loader=YAML_LOADER) or {}
+
+    # Atomic replace so concurrent starts never read a partial sidecar; 0600 since configs hold secrets
+    try:
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        # Dates would come back as strings, so they make the dump fail instead
+        tmp.write_bytes(orjson.dumps({"source": stamp, "config": config}, option=orjson.OPT_PASSTHROUGH_DATETIME))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, sidecar)
+    except (OSError, TypeError):
+        pass
+
+    return config
+
+
 def load_config(config_path: str) -> dict:
-    """Load configuration from YAML file"""
+    """Load configuration from a YAML or JSON file"""
     path = Path(config_path).expanduser()
 
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with open(path) as f:
-        config = yaml.safe_load(f)
+    # Copy so env overrides never leak into the cached parse
+    stat = path.stat()
+    config = copy.deepcopy(_load_config_cached(str(path), stat.st_mtime_ns, stat.st_size))
 
     # Override with environment variables
     env_overrides = {
@@ -92,10 +146,13 @@ def create_agent_config(config: dict, workers: int = None) -> AgentConfig:
         max_workers=workers or agent.get("max_workers", 4),
         poll_interval=agent.get("poll_interval", 1.0),
         batch_size=agent.get("batch_size", 200),
+        coalesce_threshold=agent.get("coalesce_threshold", 10),
+        log_sample_rate=agent.get("log_sample_rate", 100),
 
         # Queue settings
         queue_backend=queue.get("backend", "sqlite"),
         queue_db_path=queue.get("db_path", "~/.blackroad/task_queue.db"),
+        queue_redis_url=queue.get("redis_url", "redis://localhost:6379/0"),
     )
 
 
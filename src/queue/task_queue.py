@@ -5,20 +5,172 @@ Enables 500+ agents on Octavia to process tasks from a shared queue.
 Supports SQLite (local) or Redis (distributed) backends.
 """
 
-import json
+import sys
 import time
+import logging
 import uuid
 import sqlite3
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum
-from dataclasses import dataclass, asdict, field
-from typing import Any, Dict, List, Optional, Callable
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 from pathlib import Path
+import orjson
 import structlog
 
+try:
+    import redis
+except ImportError:  # only needed for the distributed backend
+    redis = None
+
 logger = structlog.get_logger()
 
+# Stdlib logger behind structlog's LoggerFactory; per-task events skip building
+# their event dict when their level is filtered
+_stdlib_logger = logging.getLogger(__name__)
+
+# Seconds a connection waits for another agent's write lock before erroring
+SQLITE_BUSY_TIMEOUT = 5.0
+
+# Per-connection tuning: fsync only at WAL checkpoints, 64MB page cache,
+# 256MB memory map, and temp tables kept in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Columns needed to build a claimed Task (skips result/error payloads)
+TASK_CLAIM_COLUMNS = "id, operation, sobject, data, priority, created_at, retry_count, max_retries"
+
+# First interval at which blocking reads re-check the database for tasks
+# submitted by other processes; doubles on each empty check
+EXTERNAL_POLL_INTERVAL = 1.0
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Prepared statements kept per connection; sqlite3 matches them by SQL text,
+# so the hot statements below are built once and passed unchanged every call
+SQLITE_CACHED_STATEMENTS = 256
+
+_SQL_PUSH = """
+    INSERT INTO tasks (id, operation, sobject, data, status, priority,
+                     created_at, max_retries)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_CLAIM_RETURNING = f"""
+    UPDATE tasks SET status = 'processing', started_at = ?, agent_id = ?
+    WHERE id IN (
+        SELECT id FROM tasks
+        WHERE status = 'pending'
+        ORDER BY priority DESC, created_at ASC
+        LIMIT ?
+    )
+    RETURNING {TASK_CLAIM_COLUMNS}
+"""
+
+_SQL_CLAIM_SELECT = f"""
+    SELECT {TASK_CLAIM_COLUMNS} FROM tasks
+    WHERE status = 'pending'
+    ORDER BY priority DESC, created_at ASC
+    LIMIT ?
+"""
+
+_SQL_CLAIM_MARK = """
+    UPDATE tasks SET status = 'processing', started_at = ?, agent_id = ?
+    WHERE id = ?
+"""
+
+_SQL_COMPLETE = """
+    UPDATE tasks SET status = 'completed', completed_at = ?, result = ?
+    WHERE id = ?
+"""
+
+_SQL_FAIL = """
+    UPDATE tasks SET status = 'failed', completed_at = ?, error = ?
+    WHERE id = ?
+"""
+
+_SQL_RETRY_CHECK = "SELECT retry_count, max_retries FROM tasks WHERE id = ?"
+
+_SQL_RETRY = """
+    UPDATE tasks SET status = 'pending', retry_count = retry_count + 1,
+                   started_at = NULL, agent_id = NULL
+    WHERE id = ?
+"""
+
+_SQL_STATS = "SELECT status, count FROM task_stats"
+
+# Task ids bound per IN (...) list (older SQLite builds allow 999 variables per statement)
+SQLITE_IN_CHUNK = 500
+
+_SQL_RETRY_MANY = """
+    UPDATE tasks SET status = 'pending', retry_count = retry_count + 1,
+                   started_at = NULL, agent_id = NULL
+    WHERE id IN ({ids}) AND retry_count < max_retries
+    RETURNING id
+"""
+
+_SQL_RETRY_MANY_CHECK = "SELECT id FROM tasks WHERE id IN ({ids}) AND retry_count < max_retries"
+
+# Seconds a completed or failed task's hash is kept in Redis for inspection
+REDIS_FINISHED_TASK_TTL = 7 * 24 * 3600
+
+# Pop up to ARGV[1] task ids, mark each processing, and return [id, fields, ...]
+_LUA_CLAIM = """
+local popped = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+local reply = {}
+for i = 1, #popped, 2 do
+    local key = ARGV[4] .. popped[i]
+    redis.call('HSET', key, 'status', 'processing', 'started_at', ARGV[2], 'agent_id', ARGV[3])
+    reply[#reply + 1] = popped[i]
+    reply[#reply + 1] = redis.call('HMGET', key, 'operation', 'sobject', 'data', 'priority',
+                                   'created_at', 'retry_count', 'max_retries')
+end
+local count = #popped / 2
+if count > 0 then
+    redis.call('HINCRBY', KEYS[2], 'pending', -count)
+    redis.call('HINCRBY', KEYS[2], 'processing', count)
+end
+return reply
+"""
+
+# Move a task to status ARGV[1], set the ARGV[3..] field/value pairs, keep the
+# status counts in step, and expire the hash after ARGV[2] seconds
+_LUA_TRANSITION = """
+local previous = redis.call('HGET', KEYS[1], 'status')
+if not previous then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1], unpack(ARGV, 3))
+redis.call('HINCRBY', KEYS[2], previous, -1)
+redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Requeue a task with retries left under its original score
+_LUA_RETRY = """
+local task = redis.call('HMGET', KEYS[1], 'status', 'retry_count', 'max_retries', 'score')
+if not task[1] or tonumber(task[2]) >= tonumber(task[3]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', 'pending', 'retry_count', tonumber(task[2]) + 1)
+redis.call('HDEL', KEYS[1], 'started_at', 'agent_id')
+redis.call('ZADD', KEYS[3], task[4], ARGV[1])
+redis.call('HINCRBY', KEYS[2], task[1], -1)
+redis.call('HINCRBY', KEYS[2], 'pending', 1)
+return 1
+"""
+
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -28,6 +180,26 @@ class TaskStatus(Enum):
     RETRYING = "retrying"
 
 
+def _dumps(value: Any) -> bytes:
+    """Serialize task data or results (stored as-is; orjson reads both bytes and older TEXT rows)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _id_to_db(task_id: str) -> bytes:
+    """Encode a task's UUID string as its 16-byte primary key"""
+    return uuid.UUID(task_id).bytes
+
+
+def _id_from_db(value: bytes) -> str:
+    """Decode a 16-byte primary key back to the task's UUID string"""
+    return str(uuid.UUID(bytes=value))
+
+
+def _redis_score(priority: int, created_at: float) -> str:
+    """Sorted-set score ordering higher priority first, then older first"""
+    return repr(created_at - priority * 1e12)
+
+
 class TaskPriority(Enum):
     LOW = 0
     NORMAL = 1
@@ -35,7 +207,7 @@ class TaskPriority(Enum):
     URGENT = 3
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Task:
     """A task in the queue"""
     id: str
@@ -54,16 +226,41 @@ class Task:
     agent_id: Optional[str] = None
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d['status'] = self.status.value
-        d['priority'] = self.priority.value
-        return d
+        return {
+            'id': self.id,
+            'operation': self.operation,
+            'sobject': self.sobject,
+            'data': self.data,
+            'status': self.status.value,
+            'priority': self.priority.value,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+            'result': self.result,
+            'error': self.error,
+            'retry_count': self.retry_count,
+            'max_retries': self.max_retries,
+            'agent_id': self.agent_id
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> 'Task':
-        d['status'] = TaskStatus(d['status'])
-        d['priority'] = TaskPriority(d['priority'])
-        return cls(**d)
+        return cls(
+            id=d['id'],
+            operation=d['operation'],
+            sobject=d['sobject'],
+            data=d['data'],
+            status=TaskStatus(d['status']),
+            priority=TaskPriority(d['priority']),
+            created_at=d['created_at'],
+            started_at=d.get('started_at'),
+            completed_at=d.get('completed_at'),
+            result=d.get('result'),
+            error=d.get('error'),
+            retry_count=d.get('retry_count', 0),
+            max_retries=d.get('max_retries', 3),
+            agent_id=d.get('agent_id')
+        )
 
 
 class TaskQueueBackend(ABC):
@@ -73,14 +270,27 @@ class TaskQueueBackend(ABC):
     def push(self, task: Task) -> None:
         pass
 
+    @abstractmethod
+    def push_many(self, tasks: List[Task]) -> None:
+        pass
+
     @abstractmethod
     def pop(self, agent_id: str) -> Optional[Task]:
         pass
 
+    @abstractmethod
+    def pop_batch(self, agent_id: str, limit: int) -> List[Task]:
+        pass
+
     @abstractmethod
     def complete(self, task_id: str, result: Dict[str, Any]) -> None:
         pass
 
+    def complete_and_pop(self, prev_id: str, result: Dict[str, Any], agent_id: str) -> Optional[Task]:
+        """Mark a task completed and claim the next one (backends may fuse the two)"""
+        self.complete(prev_id, result)
+        return self.pop(agent_id)
+
     @abstractmethod
     def fail(self, task_id: str, error: str) -> None:
         pass
@@ -89,10 +299,23 @@ class TaskQueueBackend(ABC):
     def retry(self, task_id: str) -> bool:
         pass
 
+    def retry_or_fail_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        """Requeue tasks with retries left and fail the rest; returns the requeued ids"""
+        retried = []
+        for task_id, error in items:
+            if self.retry(task_id):
+                retried.append(task_id)
+            else:
+                self.fail(task_id, error)
+        return retried
+
     @abstractmethod
     def get_stats(self) -> Dict[str, int]:
         pass
 
+    def close(self) -> None:
+        """Release any connections held by the backend"""
+
 
 class SQLiteBackend(TaskQueueBackend):
     """SQLite-based task queue for local operation"""
@@ -100,14 +323,47 @@ class SQLiteBackend(TaskQueueBackend):
     def __init__(self, db_path: str = "~/.blackroad/task_queue.db"):
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection, shared by all threads of this process under a lock
+        self._conn = self._connect()
+        self._lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits on, rather than fails at, a locked database"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=SQLITE_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self):
         """Initialize database schema"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._conn
+        # WAL lets readers proceed while an agent holds the write lock (persistent per file)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+        # Databases from before 16-byte BLOB ids are rebuilt once
+        columns = {row['name']: row['type'] for row in conn.execute("PRAGMA table_info(tasks)")}
+        migrate_ids = columns.get('id') == 'TEXT'
+        if migrate_ids:
+            for index in ("idx_status", "idx_priority", "idx_pending_pri", "idx_agent_processing"):
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            conn.execute("ALTER TABLE tasks RENAME TO tasks_text_ids")
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS tasks (
-                id TEXT PRIMARY KEY,
+                id BLOB PRIMARY KEY,
                 operation TEXT NOT NULL,
                 sobject TEXT NOT NULL,
                 data TEXT NOT NULL,
@@ -123,119 +379,233 @@ class SQLiteBackend(TaskQueueBackend):
                 agent_id TEXT
             )
         """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON tasks(status)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_priority ON tasks(priority DESC)")
+        if migrate_ids:
+            self._migrate_text_ids(conn)
+
+        # Per-status counts kept current by triggers, so get_stats doesn't scan the table
+        new_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_stats'"
+        ).fetchone() is None
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_stats (
+                status TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        if new_stats:
+            conn.execute("""
+                INSERT INTO task_stats (status, count)
+                SELECT status, COUNT(*) FROM tasks GROUP BY status
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON tasks
+            BEGIN
+                INSERT INTO task_stats (status, count) VALUES (NEW.status, 1)
+                ON CONFLICT(status) DO UPDATE SET count = count + 1;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE OF status ON tasks
+            WHEN OLD.status != NEW.status
+            BEGIN
+                UPDATE task_stats SET count = count - 1 WHERE status = OLD.status;
+                INSERT INTO task_stats (status, count) VALUES (NEW.status, 1)
+                ON CONFLICT(status) DO UPDATE SET count = count + 1;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks
+            BEGIN
+                UPDATE task_stats SET count = count - 1 WHERE status = OLD.status;
+            END
+        """)
+
+        # Partial indexes matching the claim query's shape, so pop reads rows in order without a sort
+        new_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_pending_pri'"
+        ).fetchone() is None
+        conn.execute("DROP INDEX IF EXISTS idx_status")
+        conn.execute("DROP INDEX IF EXISTS idx_priority")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pending_pri ON tasks(priority DESC, created_at ASC)
+            WHERE status = 'pending'
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_agent_processing ON tasks(agent_id)
+            WHERE status = 'processing'
+        """)
+        if new_index:
+            conn.execute("ANALYZE")
         conn.commit()
-        conn.close()
+
+    def _migrate_text_ids(self, conn: sqlite3.Connection):
+        """Copy rows from the old TEXT-id table into the BLOB-id table"""
+        rows = [dict(row) for row in conn.execute("SELECT * FROM tasks_text_ids")]
+        for row in rows:
+            row['id'] = _id_to_db(row['id'])
+
+        if rows:
+            columns = list(rows[0])
+            conn.executemany(
+                f"INSERT INTO tasks ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[column] for column in columns) for row in rows]
+            )
+        conn.execute("DROP TABLE tasks_text_ids")
+        logger.info("task_ids_migrated", count=len(rows))
 
     def push(self, task: Task) -> None:
         """Add task to queue"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("""
-            INSERT INTO tasks (id, operation, sobject, data, status, priority,
-                             created_at, max_retries)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            task.id, task.operation, task.sobject, json.dumps(task.data),
-            task.status.value, task.priority.value, task.created_at, task.max_retries
-        ))
-        conn.commit()
-        conn.close()
-        logger.debug("task_pushed", task_id=task.id, operation=task.operation)
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_PUSH, (
+                _id_to_db(task.id), task.operation, task.sobject, _dumps(task.data),
+                task.status.value, task.priority.value, task.created_at, task.max_retries
+            ))
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("task_pushed", task_id=task.id, operation=task.operation)
+
+    def push_many(self, tasks: List[Task]) -> None:
+        """Add tasks to queue in a single transaction"""
+        rows = [
+            (
+                _id_to_db(task.id), task.operation, task.sobject, _dumps(task.data),
+                task.status.value, task.priority.value, task.created_at, task.max_retries
+            )
+            for task in tasks
+        ]
+
+        with self._lock, self._conn as conn:
+            conn.executemany(_SQL_PUSH, rows)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tasks_pushed", count=len(tasks))
 
     def pop(self, agent_id: str) -> Optional[Task]:
         """Get next task from queue"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        tasks = self.pop_batch(agent_id, 1)
+        return tasks[0] if tasks else None
 
-        # Get highest priority pending task
-        cursor = conn.execute("""
-            SELECT * FROM tasks
-            WHERE status = 'pending'
-            ORDER BY priority DESC, created_at ASC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
+    def pop_batch(self, agent_id: str, limit: int) -> List[Task]:
+        """Claim up to `limit` tasks from the queue in a single transaction"""
+        started_at = time.time()
 
-        if not row:
-            conn.close()
-            return None
+        with self._lock, self._conn as conn:
+            rows = self._claim(conn, agent_id, limit, started_at)
 
-        # Mark as processing
-        conn.execute("""
-            UPDATE tasks SET status = 'processing', started_at = ?, agent_id = ?
-            WHERE id = ?
-        """, (time.time(), agent_id, row['id']))
-        conn.commit()
+        if not rows:
+            return []
 
-        task = Task(
-            id=row['id'],
-            operation=row['operation'],
-            sobject=row['sobject'],
-            data=json.loads(row['data']),
-            status=TaskStatus.PROCESSING,
-            priority=TaskPriority(row['priority']),
-            created_at=row['created_at'],
-            started_at=time.time(),
-            retry_count=row['retry_count'],
-            max_retries=row['max_retries'],
-            agent_id=agent_id
-        )
+        tasks = self._rows_to_tasks(rows, agent_id, started_at)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tasks_popped", count=len(tasks), agent_id=agent_id)
+        return tasks
+
+    def complete_and_pop(self, prev_id: str, result: Dict[str, Any], agent_id: str) -> Optional[Task]:
+        """Mark a task completed and claim the next one in the same transaction"""
+        now = time.time()
+
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_COMPLETE, (now, _dumps(result), _id_to_db(prev_id)))
+            rows = self._claim(conn, agent_id, 1, now)
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("task_completed", task_id=prev_id)
+
+        tasks = self._rows_to_tasks(rows, agent_id, now)
+        return tasks[0] if tasks else None
+
+    def _claim(self, conn: sqlite3.Connection, agent_id: str, limit: int, started_at: float) -> List[sqlite3.Row]:
+        """Mark the highest priority pending rows as processing and return them"""
+        if SQLITE_HAS_RETURNING:
+            # Claim and read the highest priority pending tasks in one statement
+            cursor = conn.execute(_SQL_CLAIM_RETURNING, (started_at, agent_id, limit))
+            # RETURNING doesn't preserve the subquery's order
+            return sorted(cursor.fetchall(), key=lambda row: (-row['priority'], row['created_at']))
 
-        conn.close()
-        logger.debug("task_popped", task_id=task.id, agent_id=agent_id)
-        return task
+        # Take the write lock up front so concurrent agents can't claim the same rows
+        # (an earlier write in the same transaction already holds it)
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+        # Get highest priority pending tasks
+        rows = conn.execute(_SQL_CLAIM_SELECT, (limit,)).fetchall()
+
+        # Mark as processing
+        conn.executemany(_SQL_CLAIM_MARK, [(started_at, agent_id, row['id']) for row in rows])
+        return rows
+
+    def _rows_to_tasks(self, rows: List[sqlite3.Row], agent_id: str, started_at: float) -> List[Task]:
+        """Build processing Tasks from claimed rows"""
+        return [
+            Task(
+                id=_id_from_db(row['id']),
+                operation=row['operation'],
+                sobject=row['sobject'],
+                data=orjson.loads(row['data']),
+                status=TaskStatus.PROCESSING,
+                priority=TaskPriority(row['priority']),
+                created_at=row['created_at'],
+                started_at=started_at,
+                retry_count=row['retry_count'],
+                max_retries=row['max_retries'],
+                agent_id=agent_id
+            )
+            for row in rows
+        ]
 
     def complete(self, task_id: str, result: Dict[str, Any]) -> None:
         """Mark task as completed"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("""
-            UPDATE tasks SET status = 'completed', completed_at = ?, result = ?
-            WHERE id = ?
-        """, (time.time(), json.dumps(result), task_id))
-        conn.commit()
-        conn.close()
-        logger.info("task_completed", task_id=task_id)
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_COMPLETE, (time.time(), _dumps(result), _id_to_db(task_id)))
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("task_completed", task_id=task_id)
 
     def fail(self, task_id: str, error: str) -> None:
         """Mark task as failed"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("""
-            UPDATE tasks SET status = 'failed', completed_at = ?, error = ?
-            WHERE id = ?
-        """, (time.time(), error, task_id))
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_FAIL, (time.time(), error, _id_to_db(task_id)))
         logger.warning("task_failed", task_id=task_id, error=error)
 
     def retry(self, task_id: str) -> bool:
         """Retry a failed task"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-
-        cursor = conn.execute("SELECT retry_count, max_retries FROM tasks WHERE id = ?", (task_id,))
-        row = cursor.fetchone()
+        with self._lock, self._conn as conn:
+            row = conn.execute(_SQL_RETRY_CHECK, (_id_to_db(task_id),)).fetchone()
 
-        if not row or row['retry_count'] >= row['max_retries']:
-            conn.close()
-            return False
+            if not row or row['retry_count'] >= row['max_retries']:
+                return False
 
-        conn.execute("""
-            UPDATE tasks SET status = 'pending', retry_count = retry_count + 1,
-                           started_at = NULL, agent_id = NULL
-            WHERE id = ?
-        """, (task_id,))
-        conn.commit()
-        conn.close()
+            conn.execute(_SQL_RETRY, (_id_to_db(task_id),))
         logger.info("task_retrying", task_id=task_id)
         return True
 
+    def retry_or_fail_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        """Requeue tasks with retries left and fail the rest in one transaction"""
+        db_ids = [_id_to_db(task_id) for task_id, _ in items]
+        retried = set()
+
+        with self._lock, self._conn as conn:
+            for start in range(0, len(db_ids), SQLITE_IN_CHUNK):
+                chunk = db_ids[start:start + SQLITE_IN_CHUNK]
+                ids = ", ".join("?" * len(chunk))
+                if SQLITE_HAS_RETURNING:
+                    rows = conn.execute(_SQL_RETRY_MANY.format(ids=ids), chunk).fetchall()
+                else:
+                    rows = conn.execute(_SQL_RETRY_MANY_CHECK.format(ids=ids), chunk).fetchall()
+                    conn.executemany(_SQL_RETRY, [(row[0],) for row in rows])
+                retried.update(row[0] for row in rows)
+
+            now = time.time()
+            failed = [(task_id, error) for db_id, (task_id, error) in zip(db_ids, items) if db_id not in retried]
+            conn.executemany(_SQL_FAIL, [(now, error, _id_to_db(task_id)) for task_id, error in failed])
+
+        if retried:
+            logger.info("tasks_retrying", count=len(retried))
+        for task_id, error in failed:
+            logger.warning("task_failed", task_id=task_id, error=error)
+
+        return [task_id for db_id, (task_id, _) in zip(db_ids, items) if db_id in retried]
+
     def get_stats(self) -> Dict[str, int]:
         """Get queue statistics"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.execute("""
-            SELECT status, COUNT(*) as count FROM tasks GROUP BY status
-        """)
+        with self._lock:
+            rows = self._conn.execute(_SQL_STATS).fetchall()
 
         stats = {
             "pending": 0,
@@ -245,11 +615,217 @@ class SQLiteBackend(TaskQueueBackend):
             "total": 0
         }
 
-        for row in cursor:
+        for row in rows:
             stats[row[0]] = row[1]
             stats["total"] += row[1]
 
-        conn.close()
+        return stats
+
+
+class RedisBackend(TaskQueueBackend):
+    """
+    Redis-based task queue for distributed operation.
+
+    Pending task ids live in one sorted set scored so that ZPOPMIN yields the
+    highest priority, oldest task; each task's fields live in a hash. Claims
+    and status changes run as Lua scripts, so each is atomic and costs one
+    round trip.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        max_connections: int = 8,
+        key_prefix: str = "blackroad:queue"
+    ):
+        if redis is None:
+            raise ImportError("The redis queue backend requires the redis package")
+
+        self._pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+        self._redis = redis.Redis(connection_pool=self._pool)
+        self._pending_key = f"{key_prefix}:pending"
+        self._stats_key = f"{key_prefix}:stats"
+        self._task_prefix = f"{key_prefix}:task:"
+
+        # register_script sends EVALSHA and loads the script on first miss
+        self._claim_script = self._redis.register_script(_LUA_CLAIM)
+        self._transition_script = self._redis.register_script(_LUA_TRANSITION)
+        self._retry_script = self._redis.register_script(_LUA_RETRY)
+
+    def close(self) -> None:
+        """Disconnect the connection pool"""
+        self._pool.disconnect()
+
+    def _task_key(self, task_id: str) -> str:
+        return self._task_prefix + task_id
+
+    def _queue_push(self, pipe, task: Task) -> None:
+        """Queue the commands that store and enqueue one task"""
+        score = _redis_score(task.priority.value, task.created_at)
+        pipe.hset(self._task_key(task.id), mapping={
+            "operation": task.operation,
+            "sobject": task.sobject,
+            "data": _dumps(task.data),
+            "status": task.status.value,
+            "priority": task.priority.value,
+            "created_at": repr(task.created_at),
+            "retry_count": task.retry_count,
+            "max_retries": task.max_retries,
+            "score": score,
+        })
+        pipe.zadd(self._pending_key, {task.id: score})
+
+    def push(self, task: Task) -> None:
+        """Add task to queue"""
+        self.push_many([task])
+
+    def push_many(self, tasks: List[Task]) -> None:
+        """Add tasks to queue in a single MULTI/EXEC round trip"""
+        if not tasks:
+            return
+
+        pipe = self._redis.pipeline()
+        for task in tasks:
+            self._queue_push(pipe, task)
+        pipe.hincrby(self._stats_key, TaskStatus.PENDING.value, len(tasks))
+        pipe.execute()
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tasks_pushed", count=len(tasks))
+
+    def pop(self, agent_id: str) -> Optional[Task]:
+        """Get next task from queue"""
+        tasks = self.pop_batch(agent_id, 1)
+        return tasks[0] if tasks else None
+
+    def pop_batch(self, agent_id: str, limit: int) -> List[Task]:
+        """Claim up to `limit` tasks with one script call"""
+        started_at = time.time()
+        reply = self._claim_script(
+            keys=[self._pending_key, self._stats_key],
+            args=[limit, repr(started_at), agent_id, self._task_prefix]
+        )
+        return self._reply_to_tasks(reply, agent_id, started_at)
+
+    def complete_and_pop(self, prev_id: str, result: Dict[str, Any], agent_id: str) -> Optional[Task]:
+        """Mark a task completed and claim the next one in one pipelined round trip"""
+        now = time.time()
+
+        pipe = self._redis.pipeline(transaction=False)
+        self._transition_script(
+            keys=[self._task_key(prev_id), self._stats_key],
+            args=[TaskStatus.COMPLETED.value, REDIS_FINISHED_TASK_TTL, "completed_at", repr(now), "result", _dumps(result)],
+            client=pipe
+        )
+        self._claim_script(
+            keys=[self._pending_key, self._stats_key],
+            args=[1, repr(now), agent_id, self._task_prefix],
+            client=pipe
+        )
+        _, reply = pipe.execute()
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("task_completed", task_id=prev_id)
+
+        tasks = self._reply_to_tasks(reply, agent_id, now)
+        return tasks[0] if tasks else None
+
+    def _reply_to_tasks(self, reply: List[Any], agent_id: str, started_at: float) -> List[Task]:
+        """Build processing Tasks from the claim script's [id, fields, ...] reply"""
+        tasks = []
+        for i in range(0, len(reply), 2):
+            operation, sobject, data, priority, created_at, retry_count, max_retries = reply[i + 1]
+            tasks.append(Task(
+                id=reply[i].decode(),
+                operation=operation.decode(),
+                sobject=sobject.decode(),
+                data=orjson.loads(data),
+                status=TaskStatus.PROCESSING,
+                priority=TaskPriority(int(priority)),
+                created_at=float(created_at),
+                started_at=started_at,
+                retry_count=int(retry_count),
+                max_retries=int(max_retries),
+                agent_id=agent_id
+            ))
+
+        if tasks and _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tasks_popped", count=len(tasks), agent_id=agent_id)
+        return tasks
+
+    def complete(self, task_id: str, result: Dict[str, Any]) -> None:
+        """Mark task as completed"""
+        self._transition_script(
+            keys=[self._task_key(task_id), self._stats_key],
+            args=[TaskStatus.COMPLETED.value, REDIS_FINISHED_TASK_TTL, "completed_at", repr(time.time()), "result", _dumps(result)]
+        )
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("task_completed", task_id=task_id)
+
+    def fail(self, task_id: str, error: str) -> None:
+        """Mark task as failed"""
+        self._transition_script(
+            keys=[self._task_key(task_id), self._stats_key],
+            args=[TaskStatus.FAILED.value, REDIS_FINISHED_TASK_TTL, "completed_at", repr(time.time()), "error", error]
+        )
+        logger.warning("task_failed", task_id=task_id, error=error)
+
+    def retry(self, task_id: str) -> bool:
+        """Retry a failed task"""
+        retried = self._retry_script(
+            keys=[self._task_key(task_id), self._stats_key, self._pending_key],
+            args=[task_id]
+        )
+        if not retried:
+            return False
+
+        logger.info("task_retrying", task_id=task_id)
+        return True
+
+    def retry_or_fail_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        """Requeue tasks with retries left, then fail the rest (two pipelined round trips)"""
+        pipe = self._redis.pipeline(transaction=False)
+        for task_id, _ in items:
+            self._retry_script(
+                keys=[self._task_key(task_id), self._stats_key, self._pending_key],
+                args=[task_id],
+                client=pipe
+            )
+        outcomes = pipe.execute()
+
+        retried = [task_id for (task_id, _), outcome in zip(items, outcomes) if outcome]
+        failed = [(task_id, error) for (task_id, error), outcome in zip(items, outcomes) if not outcome]
+
+        if failed:
+            now = repr(time.time())
+            pipe = self._redis.pipeline(transaction=False)
+            for task_id, error in failed:
+                self._transition_script(
+                    keys=[self._task_key(task_id), self._stats_key],
+                    args=[TaskStatus.FAILED.value, REDIS_FINISHED_TASK_TTL, "completed_at", now, "error", error],
+                    client=pipe
+                )
+            pipe.execute()
+
+        if retried:
+            logger.info("tasks_retrying", count=len(retried))
+        for task_id, error in failed:
+            logger.warning("task_failed", task_id=task_id, error=error)
+
+        return retried
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue statistics"""
+        stats = {
+            "pending": 0,
+            "processing": 0,
+            "completed": 0,
+            "failed": 0,
+            "total": 0
+        }
+
+        for status, count in self._redis.hgetall(self._stats_key).items():
+            stats[status.decode()] = int(count)
+            stats["total"] += int(count)
+
         return stats
 
 
@@ -264,13 +840,22 @@ class TaskQueue:
         if backend == "sqlite":
             self._backend = SQLiteBackend(**kwargs)
         elif backend == "redis":
-            # TODO: Implement Redis backend for distributed operation
-            raise NotImplementedError("Redis backend coming soon")
+            self._backend = RedisBackend(**kwargs)
         else:
             raise ValueError(f"Unknown backend: {backend}")
 
         self._handlers: Dict[str, Callable] = {}
 
+        # Wakes blocking readers when this process submits or requeues a task
+        self._available = threading.Condition()
+        self._generation = 0
+
+    def _notify_available(self):
+        """Wake blocking readers after a task becomes pending"""
+        with self._available:
+            self._generation += 1
+            self._available.notify_all()
+
     def register_handler(self, operation: str, handler: Callable) -> None:
         """Register a handler for an operation type"""
         self._handlers[operation] = handler
@@ -292,6 +877,7 @@ class TaskQueue:
             priority=priority
         )
         self._backend.push(task)
+        self._notify_available()
         return task.id
 
     def submit_batch(
@@ -302,25 +888,87 @@ class TaskQueue:
         priority: TaskPriority = TaskPriority.NORMAL
     ) -> List[str]:
         """Submit multiple tasks"""
-        task_ids = []
-        for data in data_list:
-            task_id = self.submit(operation, sobject, data, priority)
-            task_ids.append(task_id)
-        return task_ids
+        tasks = [
+            Task(
+                id=str(uuid.uuid4()),
+                operation=operation,
+                sobject=sobject,
+                data=data,
+                priority=priority
+            )
+            for data in data_list
+        ]
+        self._backend.push_many(tasks)
+        self._notify_available()
+        return [task.id for task in tasks]
 
     def get_next(self, agent_id: str) -> Optional[Task]:
         """Get next task for processing"""
         return self._backend.pop(agent_id)
 
+    def get_batch(self, agent_id: str, limit: int) -> List[Task]:
+        """Get up to `limit` tasks for processing in one queue round trip"""
+        return self._backend.pop_batch(agent_id, limit)
+
+    def get_next_blocking(self, agent_id: str, timeout: float = 30.0) -> Optional[Task]:
+        """Get next task for processing, waiting up to `timeout` seconds for one"""
+        tasks = self.get_batch_blocking(agent_id, 1, timeout)
+        return tasks[0] if tasks else None
+
+    def get_batch_blocking(self, agent_id: str, limit: int, timeout: float = 30.0) -> List[Task]:
+        """
+        Get up to `limit` tasks, waiting up to `timeout` seconds for any.
+
+        Wakes immediately for tasks submitted through this queue object.
+        Tasks submitted by other processes are polled for, starting at
+        EXTERNAL_POLL_INTERVAL and doubling while the queue stays empty,
+        so an idle reader rarely touches the database.
+        """
+        deadline = time.monotonic() + timeout
+        poll_interval = EXTERNAL_POLL_INTERVAL
+
+        while True:
+            generation = self._generation
+            tasks = self._backend.pop_batch(agent_id, limit)
+            remaining = deadline - time.monotonic()
+
+            if tasks or remaining <= 0:
+                return tasks
+
+            with self._available:
+                self._available.wait_for(
+                    lambda: self._generation != generation,
+                    min(remaining, poll_interval)
+                )
+            poll_interval *= 2
+
     def complete(self, task_id: str, result: Dict[str, Any]) -> None:
         """Mark task as completed"""
         self._backend.complete(task_id, result)
 
-    def fail(self, task_id: str, error: str) -> None:
-        """Mark task as failed (will retry if possible)"""
-        if not self._backend.retry(task_id):
+    def complete_and_get_next(self, task_id: str, result: Dict[str, Any], agent_id: str) -> Optional[Task]:
+        """Mark task as completed and get the next one in a single queue round trip"""
+        return self._backend.complete_and_pop(task_id, result, agent_id)
+
+    def fail(self, task_id: str, error: str, retry: bool = True) -> None:
+        """Mark task as failed (will retry if possible, unless `retry` is False)"""
+        if retry and self._backend.retry(task_id):
+            self._notify_available()
+        else:
             self._backend.fail(task_id, error)
 
+    def fail_many(self, items: List[Tuple[str, str]], retry: bool = True) -> None:
+        """Mark several (task_id, error) pairs as failed at once (each retries if possible, unless `retry` is False)"""
+        if not retry:
+            for task_id, error in items:
+                self._backend.fail(task_id, error)
+        elif items and self._backend.retry_or_fail_many(items):
+            self._notify_available()
+
     def stats(self) -> Dict[str, int]:
         """Get queue statistics"""
         return self._backend.get_stats()
+
+    def close(self) -> None:
+        """Release the backend's resources"""
+        self._backend.close()
@@ -11,6 +11,7 @@ Usage:
 """
 
 import sys
+import cmd
 import argparse
 import structlog
 
@@ -34,6 +35,73 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+class AgentShell(cmd.Cmd):
+    """Interactive command loop (readline history and tab completion come from cmd)"""
+
+    intro = """Agent ready. Commands:
+  query <SOQL>     - Run a query
+  create <obj>     - Create a record
+  limits           - Show API limits
+  stats            - Show queue stats
+  quit             - Exit
+"""
+    prompt = "🖤🛣️ > "
+
+    def __init__(self, client: SalesforceClient, queue: TaskQueue):
+        super().__init__()
+        self.client = client
+        self.queue = queue
+
+    def onecmd(self, line: str) -> bool:
+        try:
+            return super().onecmd(line)
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+
+    def emptyline(self) -> bool:
+        # Don't repeat the last command on a blank line
+        return False
+
+    def default(self, line: str):
+        print(f"Unknown command: {line}")
+
+    def do_query(self, arg: str):
+        """query <SOQL> - Run a query"""
+        # SOQL is passed through verbatim; shell-style splitting would strip its quotes
+        if not arg:
+            print("Usage: query <SOQL>")
+            return
+
+        result = self.client.query(arg)
+        print(f"Total: {result.total_size}")
+        for record in result.records[:5]:
+            print(f"  {record}")
+        if result.total_size > 5:
+            print(f"  ... and {result.total_size - 5} more")
+
+    def do_limits(self, arg: str):
+        """limits - Show API limits"""
+        limits = self.client.get_limits()
+        daily = limits.get("DailyApiRequests", {})
+        print(f"Daily API: {daily.get('Remaining')}/{daily.get('Max')}")
+
+    def do_stats(self, arg: str):
+        """stats - Show queue stats"""
+        stats = self.queue.stats()
+        print(f"Pending: {stats['pending']}, Processing: {stats['processing']}, Completed: {stats['completed']}, Failed: {stats['failed']}")
+
+    def do_quit(self, arg: str) -> bool:
+        """quit - Exit"""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, arg: str) -> bool:
+        print()
+        return True
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="BlackRoad Salesforce Agent (SFDX Mode)"
@@ -102,52 +170,10 @@ def main():
             return
 
         # Interactive mode
-        print("Agent ready. Commands:")
-        print("  query <SOQL>     - Run a query")
-        print("  create <obj>     - Create a record")
-        print("  limits           - Show API limits")
-        print("  stats            - Show queue stats")
-        print("  quit             - Exit")
-        print()
-
-        while True:
-            try:
-                cmd = input("🖤🛣️ > ").strip()
-
-                if not cmd:
-                    continue
-
-                if cmd == "quit" or cmd == "exit":
-                    break
-
-                if cmd == "limits":
-                    limits = client.get_limits()
-                    daily = limits.get("DailyApiRequests", {})
-                    print(f"Daily API: {daily.get('Remaining')}/{daily.get('Max')}")
-                    continue
-
-                if cmd == "stats":
-                    stats = queue.stats()
-                    print(f"Pending: {stats['pending']}, Processing: {stats['processing']}, Completed: {stats['completed']}, Failed: {stats['failed']}")
-                    continue
-
-                if cmd.startswith("query "):
-                    soql = cmd[6:]
-                    result = client.query(soql)
-                    print(f"Total: {result.total_size}")
-                    for record in result.records[:5]:
-                        print(f"  {record}")
-                    if result.total_size > 5:
-                        print(f"  ... and {result.total_size - 5} more")
-                    continue
-
-                print(f"Unknown command: {cmd}")
-
-            except KeyboardInterrupt:
-                print("\nExiting...")
-                break
-            except Exception as e:
-                print(f"Error: {e}")
+        try:
+            AgentShell(client, queue).cmdloop()
+        except KeyboardInterrupt:
+            print("\nExiting...")
 
     except Exception as e:
         logger.exception("agent_error", error=str(e))
@@ -0,0 +1,204 @@
+"""
+Tests for the Salesforce agent's task handling
+"""
+
+import time
+from queue import SimpleQueue
+import orjson
+import pytest
+from src.agents.salesforce_agent import AgentConfig, SalesforceAgent
+from src.api.bulk import BulkAPIError, BulkJobResult, BulkJobSubmittedError, JobState
+from src.queue.task_queue import _id_to_db
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Create an agent with a temporary queue and no Salesforce connection"""
+    # Keep the token and describe caches out of the real home directory
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = AgentConfig(
+        client_id="",
+        client_secret="",
+        username="agent@example.com",
+        password="",
+        agent_id="test-agent",
+        max_workers=2,
+        queue_db_path=str(tmp_path / "queue.db")
+    )
+    a = SalesforceAgent(config)
+    yield a
+    a.queue.close()
+
+
+def claim(agent, data_list):
+    """Submit create tasks and claim them for the agent"""
+    agent.queue.submit_batch("create", "Account", data_list)
+    return agent.queue.get_batch(agent.agent_id, len(data_list))
+
+
+def stored(agent, task):
+    """Read a task's status, result and retry count back from the queue database"""
+    row = agent.queue._backend._conn.execute(
+        "SELECT status, result, retry_count FROM tasks WHERE id = ?", (_id_to_db(task.id),)
+    ).fetchone()
+    return row["status"], orjson.loads(row["result"]) if row["result"] else None, row["retry_count"]
+
+
+def bulk_result(successful=(), failed=()):
+    """Build a finished bulk insert result"""
+    return BulkJobResult(
+        job_id="750X",
+        state=JobState.JOB_COMPLETE,
+        records_processed=len(successful) + len(failed),
+        records_failed=len(failed),
+        successful_results=list(successful),
+        failed_results=list(failed),
+        processing_time_ms=0
+    )
+
+
+def wait_for_stats(agent, status, count, timeout=5.0):
+    """Wait until `count` tasks have reached `status`"""
+    deadline = time.monotonic() + timeout
+    while agent.queue.stats()[status] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return agent.queue.stats()[status]
+
+
+class TestDispatch:
+    """Test claiming tasks and handing them to workers"""
+
+    def test_round_robin(self, agent):
+        """Test that tasks are spread across worker queues in turn"""
+        agent._worker_queues = [SimpleQueue(), SimpleQueue()]
+
+        for task in claim(agent, [{"Name": "A"}, {"Name": "B"}, {"Name": "C"}]):
+            agent._dispatch(task)
+
+        first, second = agent._worker_queues
+        assert [first.get().data["Name"], first.get().data["Name"]] == ["A", "C"]
+        assert second.get().data["Name"] == "B"
+        assert first.empty() and second.empty()
+
+    def test_dispatch_after_stop_requeues(self, agent):
+        """Test that tasks claimed after the agent stopped go back to pending"""
+        agent._start_event_loop()
+        agent._start_workers()
+        agent.stop()
+        (task,) = claim(agent, [{"Name": "Late"}])
+        group = claim(agent, [{"Name": f"Coalesced {i}"} for i in range(agent.config.coalesce_threshold)])
+
+        agent._dispatch(task)
+        agent._dispatch_batch(group)
+
+        assert stored(agent, task) == ("pending", None, 1)
+        assert [stored(agent, member) for member in group] == [("pending", None, 1)] * len(group)
+
+    def test_process_loop_dispatches_claims(self, agent, monkeypatch):
+        """Test that the main loop claims a batch and dispatches it"""
+        agent.queue.submit_batch("create", "Account", [{"Name": "A"}, {"Name": "B"}])
+        dispatched = []
+
+        def dispatch_batch(tasks):
+            dispatched.extend(tasks)
+            agent._running = False
+
+        monkeypatch.setattr(agent, "_dispatch_batch", dispatch_batch)
+        agent._running = True
+
+        agent._process_loop()
+
+        assert [task.data["Name"] for task in dispatched] == ["A", "B"]
+        assert agent.queue.stats()["processing"] == 2
+
+    def test_idle_worker_claims_next(self, agent):
+        """Test that a worker with an empty queue claims further tasks as it completes one"""
+        agent._handlers["create"] = lambda task: {"id": "001" + task.data["Name"], "success": True}
+        (first,) = claim(agent, [{"Name": "A"}])
+        agent.queue.submit_batch("create", "Account", [{"Name": "B"}, {"Name": "C"}])
+        agent._running = True
+        agent._start_workers()
+
+        agent._dispatch(first)
+
+        assert wait_for_stats(agent, "completed", 3) == 3
+        agent._running = False
+        agent._stop_workers()
+        assert agent._workers == [] and agent._worker_queues == []
+
+    def test_failed_task_is_retried(self, agent):
+        """Test that a worker records a handler error so the queue can retry the task"""
+        def fail(task):
+            raise ValueError("boom")
+
+        agent._handlers["create"] = fail
+        (task,) = claim(agent, [{"Name": "A"}])
+        agent._start_workers()
+
+        agent._dispatch(task)
+        agent._stop_workers()
+
+        assert stored(agent, task) == ("pending", None, 1)
+
+
+class TestCoalescedCreate:
+    """Test mapping bulk insert result rows back to their tasks"""
+
+    def test_matched_rows(self, agent):
+        """Test that each task gets the id from the row echoing its values"""
+        first, second = claim(agent, [{"Name": "A"}, {"Name": "B"}])
+
+        agent._complete_coalesced([first, second], bulk_result(successful=[
+            {"sf__Id": "001B", "sf__Created": "true", "Name": "B"},
+            {"sf__Id": "001A", "sf__Created": "true", "Name": "A"},
+        ]))
+
+        assert stored(agent, first)[:2] == ("completed", {"id": "001A", "success": True, "job_id": "750X"})
+        assert stored(agent, second)[:2] == ("completed", {"id": "001B", "success": True, "job_id": "750X"})
+
+    def test_duplicate_rows(self, agent):
+        """Test that tasks with identical payloads each take one of the identical rows"""
+        tasks = claim(agent, [{"Name": "Same"}, {"Name": "Same"}])
+
+        agent._complete_coalesced(tasks, bulk_result(successful=[
+            {"sf__Id": "001X", "sf__Created": "true", "Name": "Same"},
+            {"sf__Id": "001Y", "sf__Created": "true", "Name": "Same"},
+        ]))
+
+        ids = {stored(agent, task)[1]["id"] for task in tasks}
+        assert ids == {"001X", "001Y"}
+
+    def test_failed_rows_are_retried(self, agent):
+        """Test that a row Salesforce rejected sends its task back to pending"""
+        (task,) = claim(agent, [{"Name": "Bad"}])
+
+        agent._complete_coalesced([task], bulk_result(failed=[
+            {"sf__Id": "", "sf__Error": "REQUIRED_FIELD_MISSING", "Name": "Bad"},
+        ]))
+
+        assert stored(agent, task) == ("pending", None, 1)
+
+    def test_unmatched_tasks_fail_without_retry(self, agent):
+        """Test that a task whose row can't be found is failed, not retried into a duplicate"""
+        (task,) = claim(agent, [{"Name": "A", "Active__c": True}])
+
+        # Salesforce echoes the boolean as "true", which doesn't match the uploaded "True"
+        agent._complete_coalesced([task], bulk_result(successful=[
+            {"sf__Id": "001A", "sf__Created": "true", "Name": "A", "Active__c": "true"},
+        ]))
+
+        assert stored(agent, task) == ("failed", None, 0)
+
+    def test_submitted_job_errors_are_not_retried(self, agent):
+        """Test that a failure after the job's data was submitted doesn't retry the task"""
+        submitted, not_submitted = claim(agent, [{"Name": "A"}, {"Name": "B"}])
+
+        agent._fail_task(submitted, BulkJobSubmittedError("750X", BulkAPIError("timed out")))
+        agent._fail_task(not_submitted, BulkAPIError("Failed to create job"))
+
+        assert stored(agent, submitted)[0] == "failed"
+        assert stored(agent, not_submitted)[0] == "pending"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
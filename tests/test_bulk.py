@@ -0,0 +1,269 @@
+"""
+Tests for Bulk API client helpers
+"""
+
+import gzip
+import time
+import io
+import pytest
+import requests
+from urllib3 import HTTPResponse
+import src.api.bulk as bulk_module
+from src.api.bulk import BulkAPIError, BulkClient, BulkPoller, JobState, _CsvChunkIterator, _gzip_stream
+from src.auth.oauth import SalesforceAuth, TokenInfo
+
+
+class TestBulkCsv:
+    """Test CSV serialization for bulk uploads"""
+
+    @pytest.fixture
+    def bulk(self):
+        """Create a bulk client without authentication"""
+        return BulkClient(auth=None)
+
+    def test_records_to_csv_streams_chunks(self, bulk):
+        """Test that large payloads are split into multiple chunks"""
+        records = [{"Name": f"Household {i}", "Status__c": "Active"} for i in range(5000)]
+
+        chunks = list(_CsvChunkIterator(records, ["Name", "Status__c"], chunk_size=1024))
+
+        assert len(chunks) > 1
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+
+        lines = b"".join(chunks).decode().splitlines()
+        assert lines[0] == "Name,Status__c"
+        assert len(lines) == 5001
+
+    def test_records_to_csv_union_of_keys(self, bulk):
+        """Test that fields missing from the first record are still written"""
+        records = [{"Name": "A"}, {"Name": "B", "Phone": "555"}]
+
+        csv_text = b"".join(bulk._records_to_csv(records)).decode()
+
+        assert csv_text == "Name,Phone\nA,\nB,555\n"
+
+    def test_records_to_csv_single_field(self, bulk):
+        """Test serialization of delete payloads (Id only)"""
+        records = [{"Id": "001"}, {"Id": "002"}]
+
+        csv_text = b"".join(bulk._records_to_csv(records)).decode()
+
+        assert csv_text == "Id\n001\n002\n"
+
+    def test_records_to_csv_empty(self, bulk):
+        """Test that no records produce an empty body"""
+        assert list(bulk._records_to_csv([])) == []
+
+    def test_csv_round_trip(self, bulk):
+        """Test that serialized records parse back unchanged"""
+        records = [{"Id": "001", "Name": "Smith, John"}, {"Id": "002", "Name": 'The "Big" One'}]
+
+        csv_text = b"".join(bulk._records_to_csv(records)).decode()
+
+        assert bulk._csv_to_records(csv_text) == records
+
+
+    def test_gzip_stream_round_trip(self, bulk):
+        """Test that compressed upload chunks decompress to the CSV payload"""
+        records = [{"Name": f"Household {i}", "Status__c": "Active"} for i in range(5000)]
+        plain = b"".join(bulk._records_to_csv(records))
+
+        compressed = b"".join(_gzip_stream(bulk._records_to_csv(records)))
+
+        assert gzip.decompress(compressed) == plain
+        assert len(compressed) < len(plain)
+
+    def test_csv_to_records_arrow_matches_csv(self, bulk):
+        """Test that the pyarrow parser returns the same records as csv"""
+        pytest.importorskip("pyarrow")
+        csv_text = 'sf__Id,sf__Created,Name,Amount\n001,true,"Smith, John",\n002,false,"Line\nBreak",12.5\n'
+
+        assert bulk._csv_to_records_arrow(csv_text.encode("utf-8")) == bulk._csv_to_records(csv_text)
+
+
+class TestBulkResults:
+    """Test result retrieval"""
+
+    def test_get_results_returns_both_sets(self, monkeypatch):
+        """Test that successful and failed results keep their order"""
+        bulk = BulkClient(auth=None)
+        monkeypatch.setattr(bulk, "_get_result_set", lambda job_id, result_type: [{"type": result_type}])
+
+        successful, failed = bulk._get_results("750xx")
+
+        assert successful == [{"type": "successfulResults"}]
+        assert failed == [{"type": "failedResults"}]
+
+    def test_stream_to_records(self):
+        """Test parsing a gzip-encoded result body straight from the response stream"""
+        bulk = BulkClient(auth=None)
+        body = 'sf__Id,sf__Created,Name\n001,true,"Smith, John"\n002,true,"Line\nBreak"\n'
+
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = HTTPResponse(
+            body=io.BytesIO(gzip.compress(body.encode())),
+            headers={"Content-Encoding": "gzip"},
+            preload_content=False
+        )
+
+        assert bulk._stream_to_records(response) == bulk._csv_to_records(body)
+
+    def test_result_set_error_raises(self, monkeypatch):
+        """Test that a failed result download raises instead of looking like zero rows"""
+        bulk = BulkClient(auth=None)
+        monkeypatch.setattr(BulkClient, "base_url", "https://example.my.salesforce.com/jobs/ingest")
+
+        def fake_get(url, headers=None, stream=False):
+            response = requests.Response()
+            response.status_code = 500
+            response.raw = HTTPResponse(body=io.BytesIO(b"Server Error"), preload_content=False)
+            return response
+
+        monkeypatch.setattr(bulk._session, "get", fake_get)
+
+        with pytest.raises(BulkAPIError, match="successfulResults"):
+            bulk._get_result_set("750X", "successfulResults")
+
+    def test_large_result_set_parsed_from_bytes(self, monkeypatch):
+        """Test that a large result body goes to pyarrow as raw bytes"""
+        pytest.importorskip("pyarrow")
+        bulk = BulkClient(auth=None)
+        monkeypatch.setattr(BulkClient, "base_url", "https://example.my.salesforce.com/jobs/ingest")
+        monkeypatch.setattr(bulk_module, "ARROW_PARSE_THRESHOLD", 1)
+        body = 'sf__Id,sf__Created,Name\n001,true,"Café, Inc"\n'.encode("utf-8")
+        parsed = []
+
+        def fake_get(url, headers=None, stream=False):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Length"] = str(len(body))
+            response.raw = HTTPResponse(body=io.BytesIO(body), preload_content=False)
+            return response
+
+        arrow_parse = bulk._csv_to_records_arrow
+        monkeypatch.setattr(bulk._session, "get", fake_get)
+        monkeypatch.setattr(bulk, "_csv_to_records_arrow", lambda data: parsed.append(data) or arrow_parse(data))
+
+        records = bulk._get_result_set("750X", "successfulResults")
+
+        assert parsed == [body]
+        assert records == [{"sf__Id": "001", "sf__Created": "true", "Name": "Café, Inc"}]
+
+    def test_query_results_follow_locator(self, monkeypatch):
+        """Test that query result pages are fetched until the locator is null"""
+        bulk = BulkClient(auth=None)
+        monkeypatch.setattr(BulkClient, "query_url", "https://example.my.salesforce.com/jobs/query")
+        pages = {None: ("Id\n001\n002\n", "LOC1"), "LOC1": ("Id\n003\n", "null")}
+        seen = []
+
+        def fake_get(url, headers=None, params=None, stream=False):
+            locator = params.get("locator")
+            seen.append(locator)
+            body, next_locator = pages[locator]
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Sforce-Locator"] = next_locator
+            response.raw = HTTPResponse(body=io.BytesIO(body.encode()), preload_content=False)
+            return response
+
+        monkeypatch.setattr(bulk._session, "get", fake_get)
+
+        records = bulk._get_query_results("750Q", page_size=2)
+
+        assert records == [{"Id": "001"}, {"Id": "002"}, {"Id": "003"}]
+        assert seen == [None, "LOC1"]
+
+
+class TestBulkPoller:
+    """Test the shared job status poller"""
+
+    @pytest.fixture(autouse=True)
+    def fast_backoff(self, monkeypatch):
+        """Shrink the poll backoff so tests run quickly"""
+        monkeypatch.setattr(bulk_module, "POLL_BACKOFF_CAP", 0.01)
+
+    def test_watch_resolves_terminal_state(self):
+        """Test that each job resolves once it reaches a terminal state"""
+        states = {
+            "750A": iter([JobState.IN_PROGRESS, JobState.IN_PROGRESS, JobState.JOB_COMPLETE]),
+            "750B": iter([JobState.UPLOAD_COMPLETE, JobState.FAILED]),
+        }
+        poller = BulkPoller(lambda job_id: next(states[job_id]))
+
+        first = poller.watch("750A")
+        second = poller.watch("750B")
+
+        assert first.result(timeout=5) == JobState.JOB_COMPLETE
+        assert second.result(timeout=5) == JobState.FAILED
+
+    def test_watch_propagates_errors(self):
+        """Test that a failed status check fails the job's future"""
+        def get_state(job_id):
+            raise BulkAPIError("Failed to get job status")
+
+        poller = BulkPoller(get_state)
+
+        with pytest.raises(BulkAPIError):
+            poller.watch("750C").result(timeout=5)
+
+    def test_watch_times_out(self):
+        """Test that jobs still running past the timeout fail"""
+        poller = BulkPoller(lambda job_id: JobState.IN_PROGRESS)
+
+        with pytest.raises(BulkAPIError, match="timed out"):
+            poller.watch("750D", timeout=0).result(timeout=5)
+
+    def test_cancel_during_poll_keeps_poller_alive(self):
+        """Test that a job cancelled mid-poll doesn't stop later jobs from resolving"""
+        futures = {}
+
+        def get_state(job_id):
+            if job_id == "750E":
+                # The caller gives up while the status request is in flight
+                futures[job_id].cancel()
+            return JobState.JOB_COMPLETE
+
+        poller = BulkPoller(get_state)
+        futures["750E"] = poller.watch("750E", timeout=5)
+
+        assert poller.watch("750F").result(timeout=5) == JobState.JOB_COMPLETE
+        assert futures["750E"].cancelled()
+
+    def test_status_requests_time_out(self, monkeypatch):
+        """Test that job status requests can't hang the shared poller"""
+        bulk = BulkClient(auth=None)
+        monkeypatch.setattr(BulkClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0/jobs/ingest")
+        seen = {}
+
+        def fake_get(url, timeout=None):
+            seen["timeout"] = timeout
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"state": "InProgress"}'
+            return response
+
+        monkeypatch.setattr(bulk._session, "get", fake_get)
+
+        assert bulk._get_job_state("750G") == JobState.IN_PROGRESS
+        assert seen["timeout"] == bulk_module.STATUS_REQUEST_TIMEOUT
+
+
+class TestBulkAuth:
+    """Test session authorization headers"""
+
+    def test_session_header_follows_token(self, tmp_path):
+        """Test that the session Authorization header tracks token changes"""
+        auth = SalesforceAuth(username="agent@example.com", token_cache_path=str(tmp_path / "token.json"))
+        bulk = BulkClient(auth)
+
+        assert "Authorization" not in bulk._session.headers
+
+        auth._set_token(TokenInfo("first", None, "https://example.my.salesforce.com", "Bearer", time.time()))
+        assert bulk._session.headers["Authorization"] == "Bearer first"
+
+        auth._set_token(TokenInfo("second", None, "https://example.my.salesforce.com", "Bearer", time.time()))
+        assert bulk._session.headers["Authorization"] == "Bearer second"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
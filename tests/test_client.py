@@ -0,0 +1,317 @@
+"""
+Tests for the Salesforce REST client
+"""
+
+import orjson
+import pytest
+import gzip
+import time
+import requests
+import src.api.client as client_module
+from src.api.client import COLLECTION_MAX, SalesforceAPIError, SalesforceClient, _peek_next_records_url
+from src.auth.oauth import SalesforceAuth, TokenInfo
+
+
+def make_page(records, next_url=None):
+    """Build a raw /query response body the way Salesforce orders its keys"""
+    page = {"totalSize": 5, "done": next_url is None}
+    if next_url:
+        page["nextRecordsUrl"] = next_url
+    page["records"] = records
+    return orjson.dumps(page)
+
+
+class TestQueryPaging:
+    """Test SOQL pagination"""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client without authentication"""
+        return SalesforceClient(auth=None)
+
+    def test_peek_next_records_url(self):
+        """Test finding the next page URL in the response head"""
+        content = make_page([{"Id": "001"}], "/services/data/v59.0/query/01g-2000")
+
+        assert _peek_next_records_url(content) == "/services/data/v59.0/query/01g-2000"
+
+    def test_peek_ignores_child_relationship_urls(self):
+        """Test that subquery cursors inside records are not mistaken for the next page"""
+        records = [{"Id": "001", "Contacts": {"done": False, "nextRecordsUrl": "/child-cursor", "records": []}}]
+
+        assert _peek_next_records_url(make_page(records)) is None
+
+    def test_query_all_follows_pages(self, client, monkeypatch):
+        """Test that query_all collects records from every page in order"""
+        pages = {
+            "/page-2": make_page([{"Id": "003"}, {"Id": "004"}], "/page-3"),
+            "/page-3": make_page([{"Id": "005"}]),
+        }
+        monkeypatch.setattr(client, "_query_page", lambda soql: make_page([{"Id": "001"}, {"Id": "002"}], "/page-2"))
+        monkeypatch.setattr(client, "_query_more_page", lambda next_url: pages[next_url])
+
+        records = client.query_all("SELECT Id FROM Account")
+
+        assert [record["Id"] for record in records] == ["001", "002", "003", "004", "005"]
+
+    def test_iter_query_fetches_lazily(self, client, monkeypatch):
+        """Test that later pages are not requested before earlier records are consumed"""
+        fetched = []
+
+        def query_more_page(next_url):
+            fetched.append(next_url)
+            return make_page([{"Id": "003"}])
+
+        monkeypatch.setattr(client, "_query_page", lambda soql: make_page([{"Id": "001"}, {"Id": "002"}], "/page-2"))
+        monkeypatch.setattr(client, "_query_more_page", query_more_page)
+
+        records = client.iter_query("SELECT Id FROM Account")
+        assert fetched == []
+
+        assert [record["Id"] for record in records] == ["001", "002", "003"]
+        assert fetched == ["/page-2"]
+
+
+class TestCollections:
+    """Test sObject Collections batching"""
+
+    def test_create_many_chunks_requests(self, monkeypatch):
+        """Test that records are sent 200 per request and results keep input order"""
+        client = SalesforceClient(auth=None)
+        monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+        monkeypatch.setattr(SalesforceClient, "headers", {})
+        sent = []
+
+        def fake_request(method, url, headers=None, data=None, timeout=None):
+            if headers.get("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            payload = orjson.loads(data)
+            sent.append(payload)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = orjson.dumps([
+                {"id": record["Name"], "success": True, "errors": []} for record in payload["records"]
+            ])
+            return response
+
+        monkeypatch.setattr(client._session, "request", fake_request)
+
+        records = [{"Name": str(i)} for i in range(COLLECTION_MAX + 5)]
+        results = client.create_many("Account", records)
+
+        assert [len(payload["records"]) for payload in sent] == [COLLECTION_MAX, 5]
+        assert sent[0]["allOrNone"] is False
+        assert sent[0]["records"][0]["attributes"] == {"type": "Account"}
+        assert [row["id"] for row in results] == [record["Name"] for record in records]
+
+    def test_encode_body_gzips_large_payloads(self, monkeypatch):
+        """Test that only bodies past the threshold are compressed"""
+        client = SalesforceClient(auth=None)
+        monkeypatch.setattr(SalesforceClient, "headers", {"Content-Type": "application/json"})
+
+        body, headers = client._encode_body({"Name": "small"})
+        assert "Content-Encoding" not in headers
+        assert orjson.loads(body) == {"Name": "small"}
+
+        payload = {"records": [{"Name": "Household", "Status__c": "Active"}] * 500}
+        body, headers = client._encode_body(payload)
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Type"] == "application/json"
+        assert orjson.loads(gzip.decompress(body)) == payload
+
+    def test_batcher_packs_subrequests(self, monkeypatch):
+        """Test that subrequests go out 25 per call and resolve their own futures"""
+        client = SalesforceClient(auth=None)
+        monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+        monkeypatch.setattr(SalesforceClient, "headers", {})
+        sent = []
+
+        def fake_post(url, headers=None, data=None, timeout=None):
+            batch = orjson.loads(data)["batchRequests"]
+            sent.append(batch)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = orjson.dumps({"hasErrors": True, "results": [
+                {"statusCode": 400, "result": [{"message": "bad"}]} if sub["richInput"]["Name"] == "7"
+                else {"statusCode": 201, "result": {"id": sub["richInput"]["Name"], "success": True}}
+                for sub in batch
+            ]})
+            return response
+
+        monkeypatch.setattr(client._session, "post", fake_post)
+
+        with client.batch() as batcher:
+            futures = [batcher.enqueue("POST", "sobjects/Account", {"Name": str(i)}) for i in range(30)]
+
+        assert [len(batch) for batch in sent] == [25, 5]
+        assert sent[0][0]["url"] == "v59.0/sobjects/Account"
+        assert futures[3].result()["id"] == "3"
+        with pytest.raises(SalesforceAPIError):
+            futures[7].result()
+
+    def test_batcher_fails_missing_results(self, monkeypatch):
+        """Test that subrequests without a result fail instead of never resolving"""
+        client = SalesforceClient(auth=None)
+        monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+        monkeypatch.setattr(SalesforceClient, "headers", {})
+
+        def fake_post(url, headers=None, data=None, timeout=None):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = orjson.dumps({"hasErrors": False, "results": [{"statusCode": 204, "result": None}]})
+            return response
+
+        monkeypatch.setattr(client._session, "post", fake_post)
+
+        with client.batch() as batcher:
+            first = batcher.enqueue("DELETE", "sobjects/Account/001")
+            second = batcher.enqueue("DELETE", "sobjects/Account/002")
+
+        assert first.result(timeout=0) is None
+        with pytest.raises(SalesforceAPIError, match="1 results for 2 subrequests"):
+            second.result(timeout=0)
+
+
+class TestClientAuth:
+    """Test cached request headers and base URL"""
+
+    def test_headers_and_base_url_follow_token(self, tmp_path):
+        """Test that cached values are reused until the token changes"""
+        auth = SalesforceAuth(username="agent@example.com", token_cache_path=str(tmp_path / "token.json"))
+        client = SalesforceClient(auth)
+
+        auth._set_token(TokenInfo("first", None, "https://one.my.salesforce.com", "Bearer", time.time()))
+        assert client.headers is client.headers
+        assert client.headers["Authorization"] == "Bearer first"
+        assert client.base_url == "https://one.my.salesforce.com/services/data/v59.0"
+
+        auth._set_token(TokenInfo("second", None, "https://two.my.salesforce.com", "Bearer", time.time()))
+        assert client.headers["Authorization"] == "Bearer second"
+        assert client.base_url == "https://two.my.salesforce.com/services/data/v59.0"
+
+
+class TestRetry:
+    """Test which failures are retried"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Create a client with instant retries"""
+        monkeypatch.setattr(client_module, "RETRY_BACKOFF", (0, 0))
+        monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+        monkeypatch.setattr(SalesforceClient, "headers", {})
+        return SalesforceClient(auth=None)
+
+    def fake_responses(self, client, monkeypatch, outcomes):
+        """Serve canned status codes (or raise exceptions) in order, recording each call"""
+        calls = []
+
+        def fake_request(method, url, headers=None, **kwargs):
+            assert kwargs["timeout"] == client_module.REQUEST_TIMEOUT
+            outcome = outcomes[len(calls)]
+            calls.append(method)
+            if isinstance(outcome, Exception):
+                raise outcome
+            response = requests.Response()
+            response.status_code = outcome
+            response._content = b'[{"message": "Required fields are missing", "errorCode": "REQUIRED_FIELD_MISSING"}]' if outcome == 400 else b'{"id": "001"}'
+            return response
+
+        monkeypatch.setattr(client._session, "request", fake_request)
+        return calls
+
+    def test_transient_errors_retried(self, client, monkeypatch):
+        """Test that rate limits, 5xx and connection errors are retried"""
+        calls = self.fake_responses(client, monkeypatch, [429, requests.ConnectionError(), 200])
+
+        assert client.get("Account", "001") == {"id": "001"}
+        assert calls == ["GET", "GET", "GET"]
+
+    def test_create_retried_only_when_unprocessed(self, client, monkeypatch):
+        """Test that a create is resent after a 429 or a failed connect"""
+        calls = self.fake_responses(client, monkeypatch, [429, requests.ConnectTimeout(), 201])
+
+        assert client.create("Account", {}) == "001"
+        assert calls == ["POST", "POST", "POST"]
+
+    def test_create_not_retried_after_sending(self, client, monkeypatch):
+        """Test that a create that may have been processed is never resent"""
+        calls = self.fake_responses(client, monkeypatch, [requests.ReadTimeout()])
+
+        with pytest.raises(requests.ReadTimeout):
+            client.create("Account", {})
+        assert len(calls) == 1
+
+        calls = self.fake_responses(client, monkeypatch, [503])
+
+        with pytest.raises(SalesforceAPIError):
+            client.create("Account", {})
+        assert len(calls) == 1
+
+    def test_validation_error_not_retried(self, client, monkeypatch):
+        """Test that a 400 surfaces as SalesforceAPIError after one attempt"""
+        calls = self.fake_responses(client, monkeypatch, [400])
+
+        with pytest.raises(SalesforceAPIError) as exc_info:
+            client.create("Account", {})
+
+        assert exc_info.value.status_code == 400
+        assert len(calls) == 1
+
+    def test_non_json_error_body(self, client):
+        """Test that HTML and empty error bodies are kept as a message"""
+        response = requests.Response()
+        response.status_code = 404
+        response.headers["Content-Type"] = "text/html"
+        response._content = b"<html>Not Found</html>"
+
+        with pytest.raises(SalesforceAPIError) as exc_info:
+            client._handle_error(response, "get")
+
+        assert exc_info.value.error_data == {"message": "<html>Not Found</html>"}
+
+        response._content = b""
+        response.reason = "Not Found"
+
+        with pytest.raises(SalesforceAPIError) as exc_info:
+            client._handle_error(response, "get")
+
+        assert exc_info.value.error_data == {"message": "Not Found"}
+
+
+class TestDescribeCache:
+    """Test describe() caching"""
+
+    def test_describe_reuses_memory_and_disk(self, tmp_path, monkeypatch):
+        """Test that describes are fetched once and survive a new client"""
+        monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+        monkeypatch.setattr(SalesforceClient, "headers", {})
+        calls = []
+
+        def fake_request(method, url, headers=None, **kwargs):
+            calls.append(url)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"name": "Account", "fields": []}'
+            return response
+
+        first = SalesforceClient(auth=None, describe_cache_dir=str(tmp_path))
+        monkeypatch.setattr(first._session, "request", fake_request)
+
+        assert first.describe("Account")["name"] == "Account"
+        assert first.describe("Account")["name"] == "Account"
+        assert len(calls) == 1
+        assert (tmp_path / "example.my.salesforce.com" / "v59.0" / "Account.json").exists()
+
+        second = SalesforceClient(auth=None, describe_cache_dir=str(tmp_path))
+        monkeypatch.setattr(second._session, "request", fake_request)
+
+        assert second.describe("Account")["name"] == "Account"
+        assert len(calls) == 1
+
+        second.clear_describe_cache()
+        second.describe("Account")
+        assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
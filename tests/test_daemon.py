@@ -0,0 +1,299 @@
+"""
+Tests for the queue-processing daemon
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+import orjson
+import pytest
+import requests
+from src.api.bulk import BulkAPIError, JobState
+from src.api.client import CompositeBatcher, SalesforceClient
+from src.daemon import BULK_ASYNC_THRESHOLD, SalesforceDaemon
+from src.queue import Task, TaskQueue
+from src.queue.task_queue import _id_to_db
+
+
+class FakeAuth:
+    """Stands in for SalesforceAuth during shutdown"""
+
+    def close(self):
+        pass
+
+
+class SlowReapBulk:
+    """Bulk client whose job finishes quickly but whose job info is slow to fetch"""
+
+    def submit(self, sobject, operation, records, external_id_field=None):
+        return "750X"
+
+    def watch(self, job_id, timeout=None):
+        future = Future()
+        threading.Timer(0.05, future.set_result, args=(JobState.JOB_COMPLETE,)).start()
+        return future
+
+    def get_job_info(self, job_id):
+        # Still reaping after the job's future has woken any waiters
+        time.sleep(0.2)
+        return {"numberRecordsProcessed": BULK_ASYNC_THRESHOLD, "numberRecordsFailed": 0}
+
+
+class TimedOutBulk:
+    """Bulk client whose job outlives the poller's timeout"""
+
+    def __init__(self, abort_error=None):
+        self.aborted = []
+        self.abort_error = abort_error
+
+    def submit(self, sobject, operation, records, external_id_field=None):
+        return "750T"
+
+    def watch(self, job_id, timeout=None):
+        future = Future()
+        future.set_exception(BulkAPIError("Job timed out after 600s"))
+        return future
+
+    def abort_job(self, job_id):
+        self.aborted.append(job_id)
+        if self.abort_error:
+            raise self.abort_error
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path for a throwaway queue database"""
+    return str(tmp_path / "queue.db")
+
+
+@pytest.fixture
+def daemon(db_path):
+    """Create a daemon wired to a temporary queue, without authenticating"""
+    d = SalesforceDaemon("agent@example.com")
+    d.queue = TaskQueue(db_path=db_path)
+    d.auth = FakeAuth()
+    d.start_time = time.time()
+    yield d
+    d.queue.close()
+
+
+def stored(daemon, task_id):
+    """Read a task's status and retry count back from the queue database"""
+    row = daemon.queue._backend._conn.execute(
+        "SELECT status, retry_count FROM tasks WHERE id = ?", (_id_to_db(task_id),)
+    ).fetchone()
+    return row["status"], row["retry_count"]
+
+
+def stored_result(daemon, task_id):
+    """Read a task's stored result back from the queue database"""
+    row = daemon.queue._backend._conn.execute(
+        "SELECT result FROM tasks WHERE id = ?", (_id_to_db(task_id),)
+    ).fetchone()
+    return orjson.loads(row["result"])
+
+
+def fake_response(status_code, body):
+    """Build a canned JSON response"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = orjson.dumps(body)
+    return response
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a REST client that never authenticates"""
+    monkeypatch.setattr(SalesforceClient, "base_url", "https://example.my.salesforce.com/services/data/v59.0")
+    monkeypatch.setattr(SalesforceClient, "headers", {})
+    return SalesforceClient(auth=None)
+
+
+def serve_collection_rows(client, monkeypatch, rows):
+    """Answer /composite/sobjects calls with canned per-record rows"""
+    def fake_request(method, url, headers=None, data=None, timeout=None, **kwargs):
+        return fake_response(200, rows)
+
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+
+class TestCollections:
+    """Test grouping CRUD tasks into sObject Collections calls"""
+
+    def test_group_tasks(self, daemon):
+        """Test that only adjacent CRUD tasks with the same operation and sobject are grouped"""
+        tasks = [
+            Task(id=str(i), operation=operation, sobject=sobject, data={})
+            for i, (operation, sobject) in enumerate([
+                ("create", "Account"), ("create", "Account"), ("create", "Contact"),
+                ("query", "Account"), ("query", "Account"), ("update", "Contact"), ("create", "Account"),
+            ])
+        ]
+
+        groups = daemon._group_tasks(tasks)
+
+        assert [[task.id for task in group] for group in groups] == [["0", "1"], ["2"], ["3"], ["4"], ["5"], ["6"]]
+
+    def test_results_mapped_in_order(self, daemon, client, monkeypatch):
+        """Test that each task is completed or retried from the row at its position"""
+        serve_collection_rows(client, monkeypatch, [
+            {"id": "001A", "success": True, "errors": []},
+            {"id": None, "success": False, "errors": [{"message": "Required fields are missing"}]},
+            {"id": "001C", "success": True, "errors": []},
+        ])
+        daemon.client = client
+        task_ids = daemon.queue.submit_batch("create", "Account", [{"Name": "A"}, {}, {"Name": "C"}])
+
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert [stored(daemon, task_id) for task_id in task_ids] == [("completed", 0), ("pending", 1), ("completed", 0)]
+        assert stored_result(daemon, task_ids[2]) == {"id": "001C", "success": True}
+
+    def test_missing_rows_fail_tasks(self, daemon, client, monkeypatch):
+        """Test that tasks past the last result row are failed, and only non-creates retry"""
+        serve_collection_rows(client, monkeypatch, [{"id": "001A", "success": True, "errors": []}])
+        daemon.client = client
+        create_ids = daemon.queue.submit_batch("create", "Account", [{"Name": "A"}, {"Name": "B"}])
+
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert stored(daemon, create_ids[0]) == ("completed", 0)
+        assert stored(daemon, create_ids[1]) == ("failed", 0)
+
+        update_ids = daemon.queue.submit_batch("update", "Account", [{"id": "001A"}, {"id": "001B"}])
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert stored(daemon, update_ids[0]) == ("completed", 0)
+        assert stored(daemon, update_ids[1]) == ("pending", 1)
+
+    def test_request_error_does_not_resend_creates(self, daemon, client, monkeypatch):
+        """Test that a collection call failing after it was sent fails creates and retries updates"""
+        def timed_out(method, url, headers=None, data=None, timeout=None, **kwargs):
+            raise requests.exceptions.ReadTimeout("Read timed out")
+
+        monkeypatch.setattr(client._session, "request", timed_out)
+        daemon.client = client
+        create_ids = daemon.queue.submit_batch("create", "Account", [{"Name": "A"}, {"Name": "B"}])
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+        update_ids = daemon.queue.submit_batch("update", "Account", [{"id": "001A"}, {"id": "001B"}])
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert [stored(daemon, task_id) for task_id in create_ids] == [("failed", 0), ("failed", 0)]
+        assert [stored(daemon, task_id) for task_id in update_ids] == [("pending", 1), ("pending", 1)]
+
+
+class TestCompositeBatch:
+    """Test lone CRUD tasks sent through /composite/batch"""
+
+    def test_batched_tasks_resolve(self, daemon, client, monkeypatch):
+        """Test that each lone task is completed from its own subrequest result"""
+        sent = []
+
+        def fake_post(url, headers=None, data=None, timeout=None):
+            batch = orjson.loads(data)["batchRequests"]
+            sent.append(batch)
+            return fake_response(200, {"hasErrors": False, "results": [
+                {"statusCode": 201, "result": {"id": "001NEW", "success": True}},
+                {"statusCode": 204, "result": None},
+            ]})
+
+        monkeypatch.setattr(client._session, "post", fake_post)
+        daemon.client = client
+        create_id = daemon.queue.submit("create", "Account", {"Name": "A"})
+        update_id = daemon.queue.submit("update", "Contact", {"id": "003X", "LastName": "B"})
+
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert [sub["method"] for sub in sent[0]] == ["POST", "PATCH"]
+        assert stored(daemon, create_id) == ("completed", 0)
+        assert stored(daemon, update_id) == ("completed", 0)
+        assert daemon.tasks_processed == 2
+
+    def test_missing_results_fail_tasks(self, daemon, client, monkeypatch):
+        """Test that a task whose subrequest got no result is failed rather than left processing"""
+        monkeypatch.setattr(client._session, "post", lambda url, headers=None, data=None, timeout=None: fake_response(
+            200, {"hasErrors": False, "results": [{"statusCode": 204, "result": None}]}
+        ))
+        daemon.client = client
+        first_id = daemon.queue.submit("delete", "Account", {"id": "001A"})
+        second_id = daemon.queue.submit("update", "Contact", {"id": "003X", "LastName": "B"})
+
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert stored(daemon, first_id) == ("completed", 0)
+        assert stored(daemon, second_id) == ("pending", 1)
+        assert daemon.tasks_failed == 1
+
+    def test_batch_timeout_does_not_resend_creates(self, daemon, client, monkeypatch):
+        """Test that a batch failing after it was sent fails its creates and retries the rest"""
+        def timed_out(self, subrequests):
+            raise requests.exceptions.ReadTimeout("Read timed out")
+
+        monkeypatch.setattr(CompositeBatcher, "_send", timed_out)
+        daemon.client = client
+        create_id = daemon.queue.submit("create", "Account", {"Name": "A"})
+        update_id = daemon.queue.submit("update", "Contact", {"id": "003X", "LastName": "B"})
+
+        daemon._process_tasks(daemon.queue.get_batch("daemon-test", 10))
+
+        assert stored(daemon, create_id) == ("failed", 0)
+        assert stored(daemon, update_id) == ("pending", 1)
+        assert daemon.tasks_failed == 2
+
+
+class TestBulkJobs:
+    """Test bulk insert tasks left processing while their job runs"""
+
+    def submit_bulk_task(self, daemon):
+        """Submit and process a bulk insert large enough to run as a watched job"""
+        task_id = daemon.queue.submit("bulk_insert", "Account", {"records": [{"Name": "A"}] * BULK_ASYNC_THRESHOLD})
+        daemon._process_task(daemon.queue.get_next("daemon-test"))
+        return task_id
+
+    def stored_error(self, daemon, task_id):
+        """Read a task's recorded error back from the queue database"""
+        return daemon.queue._backend._conn.execute(
+            "SELECT error FROM tasks WHERE id = ?", (_id_to_db(task_id),)
+        ).fetchone()["error"]
+
+    def test_timed_out_job_is_aborted(self, daemon):
+        """Test that a job still running when polling gives up is aborted and its task failed with the job id"""
+        daemon.bulk = TimedOutBulk()
+
+        task_id = self.submit_bulk_task(daemon)
+
+        assert daemon.bulk.aborted == ["750T"]
+        assert stored(daemon, task_id) == ("failed", 0)
+        assert "750T" in self.stored_error(daemon, task_id)
+
+    def test_abort_failure_still_fails_task(self, daemon):
+        """Test that an abort error is only logged"""
+        daemon.bulk = TimedOutBulk(abort_error=BulkAPIError("Failed to abort job"))
+
+        task_id = self.submit_bulk_task(daemon)
+
+        assert stored(daemon, task_id) == ("failed", 0)
+        assert "timed out" in self.stored_error(daemon, task_id)
+
+
+class TestShutdown:
+    """Test that shutdown doesn't strand in-flight work"""
+
+    def test_waits_for_bulk_job_reaper(self, daemon, db_path):
+        """Test that the queue stays open until a running bulk job's task is completed"""
+        daemon.bulk = SlowReapBulk()
+        daemon.queue.submit("bulk_insert", "Account", {"records": [{"Name": "A"}] * BULK_ASYNC_THRESHOLD})
+        daemon._process_task(daemon.queue.get_next("daemon-test"))
+
+        daemon.running = False
+        daemon._run_loop()
+
+        queue = TaskQueue(db_path=db_path)
+        stats = queue.stats()
+        queue.close()
+        assert stats["completed"] == 1
+        assert stats["processing"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
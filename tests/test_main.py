@@ -0,0 +1,62 @@
+"""
+Tests for config loading
+"""
+
+import os
+import pytest
+import src.main as main_module
+from src.main import load_config
+
+
+class TestLoadConfig:
+    """Test reading YAML and JSON config files"""
+
+    def test_json_config(self, tmp_path):
+        """Test that a JSON config is parsed"""
+        path = tmp_path / "config.json"
+        path.write_text('{"salesforce": {"domain": "login"}, "agent": {"workers": 4}}')
+
+        assert load_config(str(path)) == {"salesforce": {"domain": "login"}, "agent": {"workers": 4}}
+
+    def test_yaml_flow_mapping(self, tmp_path):
+        """Test that a YAML config starting with a flow mapping isn't mistaken for JSON"""
+        path = tmp_path / "config.yaml"
+        path.write_text("{salesforce: {domain: test}, agent: {workers: 4}}\n")
+
+        assert load_config(str(path)) == {"salesforce": {"domain": "test"}, "agent": {"workers": 4}}
+
+    def test_yaml_config(self, tmp_path):
+        """Test that a block-style YAML config is parsed"""
+        path = tmp_path / "config.yaml"
+        path.write_text("salesforce:\n  domain: test\nagent:\n  workers: 4\n")
+
+        assert load_config(str(path)) == {"salesforce": {"domain": "test"}, "agent": {"workers": 4}}
+
+    def test_yaml_config_warns_once(self, tmp_path, monkeypatch):
+        """Test that a config needing the YAML parser is reported once, even after it changes"""
+        warnings = []
+        monkeypatch.setattr(main_module.logger, "warning", lambda event, **kw: warnings.append((event, kw["path"])))
+        path = tmp_path / "config.json"
+        path.write_text("{agent: {workers: 4}}\n")
+
+        load_config(str(path))
+        path.write_text("{agent: {workers: 8}}\n")
+        os.utime(path, ns=(0, 0))
+
+        assert load_config(str(path)) == {"agent": {"workers": 8}}
+        assert warnings == [("config_not_json", str(path))]
+
+    def test_json_config_does_not_warn(self, tmp_path, monkeypatch):
+        """Test that a real JSON config isn't reported"""
+        warnings = []
+        monkeypatch.setattr(main_module.logger, "warning", lambda event, **kw: warnings.append(event))
+        path = tmp_path / "config.json"
+        path.write_text('{"agent": {"workers": 4}}')
+
+        load_config(str(path))
+
+        assert warnings == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
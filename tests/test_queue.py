@@ -5,8 +5,12 @@ Tests for task queue system
 import pytest
 import tempfile
 import os
+import time
+import sqlite3
+import threading
 from src.queue import TaskQueue, Task, TaskStatus
-from src.queue.task_queue import TaskPriority
+from src.queue import task_queue
+from src.queue.task_queue import _SQL_CLAIM_SELECT, EXTERNAL_POLL_INTERVAL, TaskPriority
 
 
 class TestTaskQueue:
@@ -22,6 +26,7 @@ class TestTaskQueue:
         yield q
 
         # Cleanup
+        q.close()
         os.unlink(db_path)
 
     def test_submit_task(self, queue):
@@ -74,6 +79,57 @@ class TestTaskQueue:
         task = queue.get_next("test-agent")
         assert task.sobject == "High"
 
+    def test_get_batch(self, queue):
+        """Test claiming several tasks at once"""
+        for i in range(5):
+            queue.submit("create", "Test", {"Name": f"Task {i}"})
+
+        tasks = queue.get_batch("test-agent", 3)
+
+        assert len(tasks) == 3
+        assert all(task.status == TaskStatus.PROCESSING for task in tasks)
+        assert [task.data["Name"] for task in tasks] == ["Task 0", "Task 1", "Task 2"]
+
+        stats = queue.stats()
+        assert stats["processing"] == 3
+        assert stats["pending"] == 2
+
+    def test_get_batch_empty(self, queue):
+        """Test claiming from an empty queue"""
+        assert queue.get_batch("test-agent", 3) == []
+
+    def test_get_next_blocking_wakes_on_submit(self, queue):
+        """Test that a blocked reader picks up a task as soon as it is submitted"""
+        timer = threading.Timer(0.1, queue.submit, args=("create", "Account", {"Name": "Late"}))
+        timer.start()
+
+        start = time.monotonic()
+        task = queue.get_next_blocking("test-agent", timeout=10.0)
+
+        assert task is not None
+        assert task.data == {"Name": "Late"}
+        assert time.monotonic() - start < EXTERNAL_POLL_INTERVAL
+
+    def test_get_batch_blocking_backs_off(self, queue, monkeypatch):
+        """Test that an idle blocked reader polls the database less and less often"""
+        monkeypatch.setattr(task_queue, "EXTERNAL_POLL_INTERVAL", 0.01)
+        polls = []
+        pop_batch = queue._backend.pop_batch
+
+        def counting_pop_batch(agent_id, limit):
+            polls.append(time.monotonic())
+            return pop_batch(agent_id, limit)
+
+        monkeypatch.setattr(queue._backend, "pop_batch", counting_pop_batch)
+
+        assert queue.get_batch_blocking("test-agent", 1, timeout=0.5) == []
+        # Fixed 10ms polling would hit the database ~50 times
+        assert len(polls) < 10
+
+    def test_get_next_blocking_times_out(self, queue):
+        """Test that a blocked reader returns None when nothing arrives"""
+        assert queue.get_next_blocking("test-agent", timeout=0.05) is None
+
     def test_complete_task(self, queue):
         """Test completing a task"""
         task_id = queue.submit(
@@ -88,6 +144,23 @@ class TestTaskQueue:
         stats = queue.stats()
         assert stats["completed"] == 1
 
+    def test_complete_and_get_next(self, queue):
+        """Test completing a task and claiming the next in one call"""
+        first_id = queue.submit("create", "Account", {"Name": "First"})
+        second_id = queue.submit("create", "Account", {"Name": "Second"})
+
+        first = queue.get_next("test-agent")
+        second = queue.complete_and_get_next(first.id, {"id": "001"}, "test-agent")
+
+        assert first.id == first_id
+        assert second.id == second_id
+        assert second.agent_id == "test-agent"
+        assert queue.complete_and_get_next(second.id, {"id": "002"}, "test-agent") is None
+
+        stats = queue.stats()
+        assert stats["completed"] == 2
+        assert stats["processing"] == 0
+
     def test_fail_and_retry(self, queue):
         """Test failing and retrying a task"""
         task_id = queue.submit(
@@ -106,6 +179,20 @@ class TestTaskQueue:
         assert task is not None
         assert task.retry_count == 1
 
+    def test_fail_many(self, queue):
+        """Test that a batch of failures requeues tasks with retries left and fails the rest"""
+        spent_id = queue.submit("create", "Test", {"n": 1})
+        queue._backend._conn.execute("UPDATE tasks SET retry_count = max_retries")
+        fresh_ids = queue.submit_batch("create", "Test", [{"n": 2}, {"n": 3}])
+        queue.get_batch("test-agent", 3)
+
+        queue.fail_many([(spent_id, "Boom")] + [(task_id, "Boom") for task_id in fresh_ids])
+
+        stats = queue.stats()
+        assert stats["failed"] == 1
+        assert stats["pending"] == 2
+        assert [task.id for task in queue.get_batch("test-agent", 3)] == fresh_ids
+
     def test_batch_submit(self, queue):
         """Test submitting multiple tasks"""
         data_list = [
@@ -137,6 +224,121 @@ class TestTaskQueue:
         assert stats["processing"] == 0
         assert stats["completed"] == 0
 
+    def test_task_dict_round_trip(self):
+        """Test that a task survives to_dict/from_dict without touching the input dict"""
+        task = Task(id="t1", operation="create", sobject="Account", data={"Name": "A"}, priority=TaskPriority.HIGH)
+
+        d = task.to_dict()
+
+        assert d["status"] == "pending"
+        assert d["priority"] == TaskPriority.HIGH.value
+        assert Task.from_dict(d) == task
+        assert d["status"] == "pending"
+
+    def test_claim_uses_pending_index(self, queue):
+        """Test that the prepared claim statement is planned on the partial index"""
+        conn = queue._backend._conn
+
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _SQL_CLAIM_SELECT, (10,)))
+
+        assert "idx_pending_pri" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_migrates_text_ids(self, tmp_path):
+        """Test that a database with TEXT task ids is converted and stays usable"""
+        db_path = tmp_path / "old.db"
+        task_id = "6f1c2a9e-8d4b-4c3a-9e2f-1a2b3c4d5e6f"
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""
+            CREATE TABLE tasks (
+                id TEXT PRIMARY KEY, operation TEXT NOT NULL, sobject TEXT NOT NULL,
+                data TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending',
+                priority INTEGER NOT NULL DEFAULT 1, created_at REAL NOT NULL,
+                started_at REAL, completed_at REAL, result TEXT, error TEXT,
+                retry_count INTEGER NOT NULL DEFAULT 0, max_retries INTEGER NOT NULL DEFAULT 3,
+                agent_id TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX idx_status ON tasks(status)")
+        conn.execute(
+            "INSERT INTO tasks (id, operation, sobject, data, created_at) VALUES (?, 'create', 'Account', '{}', 1.0)",
+            (task_id,)
+        )
+        conn.commit()
+        conn.close()
+
+        queue = TaskQueue(backend="sqlite", db_path=str(db_path))
+        task = queue.get_next("test-agent")
+        queue.complete(task.id, {"success": True})
+
+        assert task.id == task_id
+        assert queue.stats()["completed"] == 1
+        queue.close()
+
+
+class TestRedisBackend:
+    """Test the Redis queue backend against an in-process fake server"""
+
+    @pytest.fixture
+    def queue(self, monkeypatch):
+        """Create a queue whose connection pool talks to fakeredis"""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+        import redis
+
+        server = fakeredis.FakeServer()
+        connection_class = getattr(fakeredis, "FakeRedisConnection", None) or fakeredis.FakeConnection
+        monkeypatch.setattr(redis.ConnectionPool, "from_url", classmethod(
+            lambda cls, url, **kwargs: redis.ConnectionPool(
+                connection_class=connection_class, server=server, **kwargs
+            )
+        ))
+
+        q = TaskQueue(backend="redis", url="redis://localhost:6379/0")
+        yield q
+        q.close()
+
+    def test_priority_ordering_and_fused_complete(self, queue):
+        """Test that claims follow priority and a completion can claim the next task"""
+        queue.submit("create", "Low", {}, priority=TaskPriority.LOW)
+        queue.submit("create", "High", {"Name": "H"}, priority=TaskPriority.HIGH)
+
+        first = queue.get_next("test-agent")
+        second = queue.complete_and_get_next(first.id, {"id": "001"}, "test-agent")
+
+        assert first.sobject == "High"
+        assert first.data == {"Name": "H"}
+        assert second.sobject == "Low"
+        assert queue.stats() == {"pending": 0, "processing": 1, "completed": 1, "failed": 0, "total": 2}
+
+    def test_retries_then_fails(self, queue):
+        """Test that a failing task is requeued until its retries run out"""
+        task_id = queue.submit("create", "Test", {})
+
+        for attempt in range(3):
+            task = queue.get_next("test-agent")
+            assert task.retry_count == attempt
+            queue.fail(task_id, "Test error")
+
+        queue.get_next("test-agent")
+        queue.fail(task_id, "Test error")
+
+        assert queue.get_next("test-agent") is None
+        assert queue.stats()["failed"] == 1
+
+    def test_fail_many(self, queue):
+        """Test that batched failures are requeued until their retries run out"""
+        task_ids = queue.submit_batch("create", "Test", [{}, {}])
+
+        for attempt in range(4):
+            queue.get_batch("test-agent", 2)
+            queue.fail_many([(task_id, "Test error") for task_id in task_ids])
+
+        stats = queue.stats()
+        assert stats["failed"] == 2
+        assert stats["pending"] == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])